@@ -4,6 +4,7 @@ from app.api.v1.endpoints.products import router as products_router
 from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.cart import router as cart_router
 from app.api.v1.endpoints.order import router as order_router
+from app.api.v1.endpoints.metrics import router as metrics_router
 
 router = APIRouter()
 
@@ -12,3 +13,4 @@ router.include_router(products_router)
 router.include_router(auth_router)
 router.include_router(cart_router)
 router.include_router(order_router)
+router.include_router(metrics_router)
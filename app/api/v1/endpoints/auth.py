@@ -4,15 +4,19 @@ from fastapi import APIRouter, HTTPException, Response
 from fastapi.params import Depends, Cookie
 from sqlalchemy import select
 from sqlalchemy.dialects.sqlite import insert
-from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.endpoints.users import password_hash
-from app.core.security import create_access_token, create_refresh_token, verify_refresh_token
-from app.db.session import get_session
+from app.core.config import REFRESH_TOKEN_MAX_SESSIONS
+from app.core.password import password_hasher
+from app.core.security import create_access_token, create_refresh_token, verify_refresh_token, hash_token, \
+    new_token_family, refresh_token_expires_at
+from app.db.batcher import commit_write
+from app.db.session import get_session, get_read_session
 from app.models import User, RefreshToken
 from app.schemas.auth import UserSignin
 from app.schemas.user import UserData
+from app.services.refresh_token import evict_old_sessions, rotate_refresh_token, save_rotated_tokens, \
+    get_rotated_tokens, Rotation
 
 router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 
@@ -20,29 +24,36 @@ router = APIRouter(prefix="/api/v1/auth", tags=["auth"])
 @router.post("/signin", status_code=200)
 async def signin(request: UserSignin,
                  response: Response,
-                 session: AsyncSession = Depends(get_session)):
+                 session: AsyncSession = Depends(get_session),
+                 read_session: AsyncSession = Depends(get_read_session)):
     email = request.email
     password = request.password
 
-    user = (await session.execute(select(User).where(User.email == email))).scalar_one_or_none()
+    # 해싱 검증 동안 쓰기 연결을 점유하지 않도록 조회는 읽기 세션으로
+    user = (await read_session.execute(select(User).where(User.email == email))).scalar_one_or_none()
 
     unauthorize_exception = HTTPException(status_code=401, detail="Email or password is invalid")
     if user is None:
         raise unauthorize_exception
 
-    verify = password_hash.verify(password, user.hashed_password)
+    verify = await password_hasher.verify(password, user.hashed_password)
     if not verify:
         raise unauthorize_exception
 
-    access_token = create_access_token(UserData.model_validate(user))
-    refresh_token = create_refresh_token(user.id)
+    user_data = UserData.model_validate(user)
+    family_id = new_token_family()
+    access_token = create_access_token(user_data)
+    refresh_token = create_refresh_token(user_data, family_id)
 
-    # upsert
-    stmt = insert(RefreshToken).values(user_id=user.id, token=refresh_token)
-    stmt = stmt.on_conflict_do_update(index_elements=[RefreshToken.user_id],
-                                      set_={"token": refresh_token})
-    await session.execute(stmt)
-    await session.commit()
+    # 새 signin은 새로운 세션(token family), 다른 기기의 세션은 유지
+    async def save_refresh_token(write_session: AsyncSession):
+        await write_session.execute(insert(RefreshToken).values(user_id=user.id,
+                                                                token_hash=hash_token(refresh_token),
+                                                                family_id=family_id,
+                                                                expires_at=refresh_token_expires_at()))
+        await evict_old_sessions(write_session, user.id, REFRESH_TOKEN_MAX_SESSIONS)
+
+    await commit_write(session, save_refresh_token)
 
     response.set_cookie(key="access_token", value=access_token, httponly=True, samesite="lax")
     response.set_cookie(key="refresh_token", value=refresh_token, httponly=True, samesite="lax")
@@ -58,22 +69,31 @@ async def generate_refresh_token(response: Response,
         raise HTTPException(status_code=400, detail="refresh token is required")
 
     payload = verify_refresh_token(refresh_token)
-    user_id = int(payload.get("sub"))
 
-    stmt = select(RefreshToken).where(RefreshToken.user_id == user_id).options(selectinload(RefreshToken.user))
-    result = (await session.execute(stmt)).scalar_one_or_none()
+    # User 조회 없이 refresh token에 담긴 claim으로 발급
+    user = UserData(id=payload.sub, email=payload.user.email, role=payload.user.role, is_active=True)
+    new_access_token = create_access_token(user)
+    new_refresh_token = create_refresh_token(user, payload.fid)
 
-    if result is None or result.token != refresh_token:
-        raise HTTPException(status_code=401, detail="invalid jwt")
+    token_hash = hash_token(refresh_token)
 
-    new_access_token = create_access_token(UserData.model_validate(result.user))
-    new_refresh_token = create_refresh_token(user_id)
+    async def rotate(write_session: AsyncSession) -> Rotation:
+        rotation = await rotate_refresh_token(write_session, token_hash, hash_token(new_refresh_token), payload.fid)
+        if rotation is Rotation.ROTATED:
+            # commit 직후 들어온 동시 요청도 현재 토큰을 받을 수 있도록 commit 전에 저장
+            await save_rotated_tokens(token_hash, new_access_token, new_refresh_token)
+        return rotation
+
+    rotation = await commit_write(session, rotate)
+    if rotation is Rotation.REUSED:
+        raise HTTPException(status_code=401, detail="invalid jwt")
 
-    stmt = insert(RefreshToken).values(user_id=user_id, token=new_refresh_token)
-    stmt = stmt.on_conflict_do_update(index_elements=[RefreshToken.user_id],
-                                      set_={"token": new_refresh_token})
-    await session.execute(stmt)
-    await session.commit()
+    if rotation is Rotation.RACED:
+        tokens = await get_rotated_tokens(token_hash)
+        if tokens is None:
+            # 현재 토큰을 알 수 없는 경우 (공유되지 않는 캐시 백엔드), family는 유지하고 먼저 교체한 응답의 토큰 사용
+            raise HTTPException(status_code=409, detail="refresh token already rotated")
+        new_access_token, new_refresh_token = tokens
 
     response.set_cookie(key="access_token", value=new_access_token, httponly=True, samesite="lax")
     response.set_cookie(key="refresh_token", value=new_refresh_token, httponly=True, samesite="lax")
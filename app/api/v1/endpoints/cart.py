@@ -1,17 +1,23 @@
 import logging
+from collections import defaultdict
+from typing import List, Dict
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Body, Header
 from fastapi.params import Depends
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.core.get_current_user import get_current_user
-from app.db.session import get_session
-from app.models import Cart, Product, CartItem
+from app.db.batcher import commit_write
+from app.db.session import get_session, get_read_session
+from app.models import Product
 from app.schemas.cart import CartItemCreate, CartResponse
 from app.schemas.user import UserData
+from app.services.cart import upsert_cart, upsert_cart_item, upsert_cart_items, product_stocks_query, \
+    cart_revision_query, cart_items_query
+from app.services.product_cache import product_cache
+from app.utils.response import json_response, etag_matches, not_modified
 
 router = APIRouter(prefix="/api/v1/cart")
 
@@ -21,61 +27,79 @@ async def add_cart_item(request: CartItemCreate,
                         session: AsyncSession = Depends(get_session),
                         current_user: UserData = Depends(get_current_user)):
     """Cart item 추가"""
-    user_cart = await session.scalar(select(Cart).where(Cart.user_id == current_user.id))
-
-    # 장바구니가 없으면 생성함
-    if not user_cart:
-        user_cart = Cart(user_id=current_user.id)
-        session.add(user_cart)
-        await session.flush()
-
-    product = await session.scalar(select(Product).where(Product.id == request.product_id))
-    if product is None:
-        logging.error(f"product_id {request.product_id} is not found")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"product_id {request.product_id} is not found")
-
-    if product.quantity < request.quantity:
-        logging.error(f"product_id {request.product_id} current quantity: {product.quantity},\n "
-                      f"request quantity: {request.quantity}")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=f"product_id {request.product_id} current quantity: {product.quantity},\n "
-                                   f"request quantity: {request.quantity}")
-
-    # 이미 담긴 아이템인지 확인
-    stmt_item = select(CartItem).where(CartItem.cart_id == user_cart.id,
-                                       CartItem.product_id == request.product_id)
-    existing_item = await session.scalar(stmt_item)
-
-    # 이미 존재하는 항목이라면 수량만 증가
-    if existing_item:
-        existing_item.quantity += request.quantity
-        session.add(existing_item)
-    else:
-        cart_item = CartItem(cart_id=user_cart.id,
-                             product_id=request.product_id,
-                             quantity=request.quantity)
-        session.add(cart_item)
-
-    await session.commit()
+    async def add_item(write_session: AsyncSession):
+        cart_id = await upsert_cart(write_session, current_user.id)
+        cart_item = await upsert_cart_item(write_session, cart_id, request.product_id, request.quantity)
+
+        # 상품이 없거나 재고가 부족한 경우에만 원인 확인을 위해 상품 조회
+        if cart_item is None:
+            product_quantity = await write_session.scalar(select(Product.quantity)
+                                                          .where(Product.id == request.product_id))
+            if product_quantity is None:
+                logging.error(f"product_id {request.product_id} is not found")
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                    detail=f"product_id {request.product_id} is not found")
+
+            logging.error(f"product_id {request.product_id} current quantity: {product_quantity},\n "
+                          f"request quantity: {request.quantity}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"product_id {request.product_id} current quantity: {product_quantity},\n "
+                                       f"request quantity: {request.quantity}")
+
+    await commit_write(session, add_item)
+
+
+@router.post("/items", status_code=status.HTTP_201_CREATED)
+async def add_cart_items(request: List[CartItemCreate] = Body(min_length=1, max_length=200),
+                         session: AsyncSession = Depends(get_session),
+                         current_user: UserData = Depends(get_current_user)):
+    """Cart item 여러 개를 한 트랜잭션으로 추가, 하나라도 실패하면 전체 실패"""
+    quantities: Dict[int, int] = defaultdict(int)
+    for item in request:
+        quantities[item.product_id] += item.quantity
+
+    async def add_items(write_session: AsyncSession):
+        # 상품 존재, 재고를 IN 쿼리 한 번으로 검증
+        stocks = dict((await write_session.execute(product_stocks_query(quantities.keys()))).tuples().all())
+
+        not_found = [product_id for product_id in quantities if product_id not in stocks]
+        if not_found:
+            logging.error(f"product_id {not_found} is not found")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"product_id {not_found} is not found")
+
+        insufficient = [product_id for product_id, quantity in quantities.items() if stocks[product_id] < quantity]
+        if insufficient:
+            logging.error(f"product_id {insufficient} insufficient quantity")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=f"product_id {insufficient} insufficient quantity")
+
+        cart_id = await upsert_cart(write_session, current_user.id)
+        await upsert_cart_items(write_session, cart_id, quantities)
+
+    await commit_write(session, add_items)
 
 
 @router.get("", status_code=200, response_model=CartResponse)
-async def get_cart(current_user: UserData = Depends(get_current_user),
-                   session: AsyncSession = Depends(get_session)):
-    stmt = (
-        select(Cart)
-        .options(selectinload(Cart.items))
-        .where(Cart.user_id == current_user.id)
-    )
-
-    result = (await session.execute(stmt)).scalar_one_or_none()
-    if not result:
-        return CartResponse(id=-1, items=[], total_price=0)
-
-    total_price = 0
-
-    for item in result.items:
-        total_price += (item.product.price * item.quantity)
-
-    return CartResponse(id=result.id, items=result.items, total_price=total_price)
+async def get_cart(if_none_match: str | None = Header(default=None),
+                   current_user: UserData = Depends(get_current_user),
+                   session: AsyncSession = Depends(get_read_session)):
+    # 응답에 상품 정보(가격, 재고)가 포함되므로 장바구니 revision과 카탈로그 version을 함께 사용
+    _, catalog_etag = await product_cache.current()
+    catalog_etag = catalog_etag.strip('"')
+    cart = (await session.execute(cart_revision_query(current_user.id))).one_or_none()
+    cart_id, revision = cart if cart else (-1, 0)
+    etag = f'"{cart_id}.{revision}.{catalog_etag}"'
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    if not cart:
+        return json_response(CartResponse(id=-1, items=[], total_price=0), etag=etag)
+
+    rows = (await session.execute(cart_items_query(cart_id))).all()
+
+    items = [row[0] for row in rows]
+    total_price, item_count = (rows[0][1], rows[0][2]) if rows else (0, 0)
+
+    return json_response(CartResponse(id=cart_id, items=items, total_price=total_price, item_count=item_count),
+                         etag=etag)
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.constants.role import Role
+from app.core.get_current_user import get_current_user, token_cache
+from app.core.password import password_hasher
+from app.db.batcher import write_batcher
+from app.schemas.user import UserData
+from app.services.product_cache import product_cache
+from app.services.sweeper import sweeper
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["metrics"])
+
+
+@router.get("", status_code=200)
+async def get_metrics(user: UserData = Depends(get_current_user)):
+    """모니터링용 프로세스 내부 지표 (캐시 적중률, 메모리 사용량 등), 관리자만 조회 가능"""
+    if user.role != Role.ADMIN:
+        raise HTTPException(status_code=403, detail="admin only")
+
+    return {
+        "token_cache": token_cache.stats(),
+        "product_cache": product_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "write_batcher": write_batcher.stats() if write_batcher is not None else None,
+        "sweeper": sweeper.stats(),
+    }
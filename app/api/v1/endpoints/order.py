@@ -1,18 +1,25 @@
-from typing import List
+from collections import defaultdict
+from math import ceil
+from typing import List, Dict
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi.params import Depends
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from starlette import status
 
+from app.constants.file_format import FileFormat
+from app.core.config import EXPORT_BATCH_SIZE
 from app.core.get_current_user import get_current_user
-from app.db.session import get_session
-from app.models import Cart, OrderItem, Order, CartItem
+from app.db.session import get_session, get_read_session
+from app.models import Cart, OrderItem, Order
 from app.schemas.order import OrderCreate, OrderItemResponse, OrderResponse
 from app.schemas.pagination import PageParams, PaginationResponse
 from app.schemas.user import UserData
+from app.services.export import stream_models, encode_export, MEDIA_TYPES
+from app.services.order import user_cart_query, order_count_query, orders_page_query, orders_export_query
+from app.services.product_cache import product_cache
+from app.services.stock import reserve_stock, InsufficientStockError
 
 router = APIRouter(prefix="/api/v1/order")
 
@@ -21,13 +28,7 @@ router = APIRouter(prefix="/api/v1/order")
 async def create_order(request: OrderCreate,
                        session: AsyncSession = Depends(get_session),
                        current_user: UserData = Depends(get_current_user)):
-    stmt = (
-        select(Cart)
-        .where(Cart.user_id == current_user.id)
-        .options(selectinload(Cart.items).selectinload(CartItem.product))
-
-    )
-    user_cart: Cart | None = await session.scalar(stmt)
+    user_cart: Cart | None = await session.scalar(user_cart_query(current_user.id))
 
     # 장바구니 검색
     if not user_cart:
@@ -35,24 +36,31 @@ async def create_order(request: OrderCreate,
     if not user_cart.items:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="empty user cart")
 
+    quantities: Dict[int, int] = defaultdict(int)
+    for cart_item in user_cart.items:
+        quantities[cart_item.product_id] += cart_item.quantity
+
+    # 재고 확인 및 차감, 하나라도 부족하면 전체 주문 실패
+    try:
+        reserved = await reserve_stock(session, quantities)
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"product_id {e.product_ids} insufficient quantity")
+
     # 장바구니에 있는 아이템을 주문 리스트로 담기
     order_items: List[OrderItem] = []
     for cart_item in user_cart.items:
-        # 재고 확인 todo: 동시성 문제 해결하기
-        if cart_item.product.quantity < cart_item.quantity:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=f"procduct_id {cart_item.product_id} insufficient quantity")
-        # 재고 차감
-        cart_item.product.quantity -= cart_item.quantity
-
+        product = reserved[cart_item.product_id]
         order_item = OrderItem(
             product_id=cart_item.product_id,
-            order_price=cart_item.product.price,
+            product_name=product.name,
+            order_price=product.price,
             quantity=cart_item.quantity)
         order_items.append(order_item)
 
     # 장바구니 비우기
     user_cart.items = []
+    user_cart.revision += 1
 
     # 주문 아이템으로 새로운 주문 생성
     new_order = Order(user_id=current_user.id,
@@ -62,6 +70,8 @@ async def create_order(request: OrderCreate,
     session.add(new_order)
 
     await session.commit()
+    # 재고가 변경되었으므로 상품 캐시 무효화
+    await product_cache.invalidate()
 
     order_item_responses = [OrderItemResponse.model_validate(item) for item in new_order.items]
 
@@ -76,24 +86,41 @@ async def create_order(request: OrderCreate,
 
 @router.get("", status_code=200, response_model=PaginationResponse[OrderResponse])
 async def get_order(page_params: PageParams = Depends(),
-                    session: AsyncSession = Depends(get_session),
+                    session: AsyncSession = Depends(get_read_session),
                     current_user: UserData = Depends(get_current_user)):
-    stmt = (
-        select(
-            Order,
-            func.count().over().label("total_count")
-        )
-        .where(Order.user_id == current_user.id)
-        .offset((page_params.page - 1) * page_params.size)
-        .limit(page_params.size)
-    )
-    result = await session.execute(stmt)
-    result = result.all()
+    total_items = await session.scalar(order_count_query(current_user.id))
+    orders = (await session.scalars(orders_page_query(current_user.id, page_params.page, page_params.size))).all()
 
     return PaginationResponse(
         current_page=page_params.page,
-        size=len(result),
-        total_page=1,
-        total_items=1,
-        items=[OrderResponse.model_validate(row[0]) for row in result]
+        size=len(orders),
+        total_page=ceil(total_items / page_params.size),
+        total_items=total_items,
+        items=[OrderResponse.model_validate(order) for order in orders]
     )
+
+
+# 주문 아이템 단위로 한 줄씩 출력
+ORDER_CSV_FIELDS = ["order_id", "status", "total_price", "shipping_address", "created_at",
+                    "item_id", "product_id", "product_name", "order_price", "quantity"]
+
+
+def _order_csv_rows(order: OrderResponse) -> list[dict]:
+    fields = {"order_id": order.id, "status": order.status.value, "total_price": order.total_price,
+              "shipping_address": order.shipping_address, "created_at": order.created_at.isoformat()}
+    return [{**fields, "item_id": item.id, **item.model_dump(exclude={"id"})} for item in order.items]
+
+
+@router.get("/export", status_code=200)
+async def export_orders(file_format: FileFormat = Query(FileFormat.NDJSON, alias="format"),
+                        session: AsyncSession = Depends(get_read_session),
+                        current_user: UserData = Depends(get_current_user)):
+    """유저의 전체 주문을 주문 순서대로 NDJSON, CSV 스트리밍 export, 주문 아이템은 batch마다 한 번에 로딩"""
+    partitions = stream_models(session,
+                               orders_export_query(current_user.id),
+                               lambda row: OrderResponse.model_validate(row[0]),
+                               EXPORT_BATCH_SIZE)
+    content = encode_export(partitions, file_format, csv_fields=ORDER_CSV_FIELDS, to_csv_rows=_order_csv_rows)
+
+    return StreamingResponse(content, media_type=MEDIA_TYPES[file_format],
+                             headers={"Content-Disposition": f"attachment; filename=orders.{file_format.value}"})
@@ -1,16 +1,28 @@
+import json
 from math import ceil
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.constants.file_format import FileFormat
+from app.core.config import PRODUCT_IMPORT_BATCH_SIZE, EXPORT_BATCH_SIZE
 from app.core.get_current_user import get_current_user
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
 from app.models import Product
-from app.schemas.pagination import PaginationResponse, PageParams
-from app.schemas.product import ProductCreate, ProductData
+from app.schemas.pagination import PaginationResponse, PageParams, CursorPaginationResponse, CursorParams
+from app.schemas.product import ProductCreate, ProductData, ProductListParams
 from app.schemas.user import UserData
+from app.services.counter import get_count
+from app.services.export import stream_models, encode_export, MEDIA_TYPES
+from app.services.product_cache import product_cache
+from app.services.product_import import iter_lines, parse_rows, import_products, product_name_exists_query
+from app.services.product_listing import apply_filters, apply_sort, apply_keyset, cursor_values
+from app.services.product_search import build_match_query, search_products
+from app.utils.cursor import encode_cursor
 from app.utils.normalize_name import normalize_name
+from app.utils.response import json_response, etag_matches, not_modified, RequestStreamingResponse
 
 router = APIRouter(prefix="/api/v1/products", tags=["products"])
 
@@ -20,10 +32,9 @@ async def add_product(request: ProductCreate,
                       session: AsyncSession = Depends(get_session),
                       user: UserData = Depends(get_current_user)) -> ProductData:
     normalized_name = normalize_name(request.name)
-    stmt = select(Product).where(func.trim(Product.name) == normalized_name)
-    result = (await session.execute(stmt)).scalar_one_or_none()
+    is_exist_name = await session.scalar(product_name_exists_query(normalized_name))
 
-    if result is not None:
+    if is_exist_name:
         raise HTTPException(status_code=409, detail="Already exist product name")
 
     new_product = Product(
@@ -36,33 +47,199 @@ async def add_product(request: ProductCreate,
     session.add(new_product)
     await session.commit()
     await session.refresh(new_product)
+    await product_cache.invalidate()
 
     return ProductData.model_validate(new_product)
 
 
+@router.post("/import", status_code=200)
+async def import_products_stream(request: Request,
+                                 file_format: FileFormat = Query(FileFormat.NDJSON, alias="format"),
+                                 session: AsyncSession = Depends(get_session),
+                                 user: UserData = Depends(get_current_user)):
+    """
+    NDJSON, CSV 상품 목록 대량 등록, 요청 body를 스트리밍으로 읽으면서 batch 단위로 insert
+    실패, 중복 row의 report와 마지막 summary를 NDJSON으로 스트리밍 응답
+    """
+    async def reports():
+        rows = parse_rows(iter_lines(request.stream()), file_format)
+        async for report in import_products(session, rows, PRODUCT_IMPORT_BATCH_SIZE):
+            if report["status"] == "summary" and report["created"]:
+                await product_cache.invalidate()
+            yield json.dumps(report, ensure_ascii=False) + "\n"
+
+    return RequestStreamingResponse(reports(), media_type="application/x-ndjson")
+
+
+@router.get("/export", status_code=200)
+async def export_products(file_format: FileFormat = Query(FileFormat.NDJSON, alias="format"),
+                          session: AsyncSession = Depends(get_read_session),
+                          user: UserData = Depends(get_current_user)):
+    """전체 상품을 id 순으로 NDJSON, CSV 스트리밍 export"""
+    stmt = (
+        select(Product.id, Product.name, Product.description, Product.price, Product.quantity)
+        .order_by(Product.id)
+    )
+    partitions = stream_models(session, stmt, ProductData.model_validate, EXPORT_BATCH_SIZE)
+    content = encode_export(partitions, file_format, csv_fields=list(ProductData.model_fields))
+
+    return StreamingResponse(content, media_type=MEDIA_TYPES[file_format],
+                             headers={"Content-Disposition": f"attachment; filename=products.{file_format.value}"})
+
+
 @router.get("", status_code=200, response_model=PaginationResponse[ProductData])
 async def get_products(params: PageParams = Depends(),
-                       session: AsyncSession = Depends(get_session)):
+                       list_params: ProductListParams = Depends(),
+                       if_none_match: str | None = Header(default=None),
+                       session: AsyncSession = Depends(get_read_session)):
+    cache_key = f"page:{params.page}:{params.size}:{list_params.cache_key}"
+    # 조회 전에 ETag를 정해야 조회 중 변경된 데이터가 이전 ETag로 응답되지 않음
+    version, etag = await product_cache.current()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cached = await product_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, etag=etag)
+
+    filtered = apply_filters(select(Product), list_params.min_price, list_params.max_price, list_params.in_stock)
     stmt = (
-        select(Product,
-               func.count().over().label("total_count")
-               )
+        apply_sort(filtered, list_params.sort)
         .offset((params.page - 1) * params.size)
         .limit(params.size))
 
-    result = (await session.execute(stmt)).all()
+    products = (await session.scalars(stmt)).all()
 
-    if not result:
+    if not products:
         raise HTTPException(status_code=400, detail="no more data")
 
-    products = [row[0] for row in result]
-    total_items = result[0][1]
+    if list_params.is_filtered:
+        total_items = await session.scalar(select(func.count()).select_from(filtered.subquery()))
+    else:
+        # window COUNT 대신 트리거로 유지되는 카운터 사용
+        total_items = await get_count(session, Product.__tablename__)
     total_page = ceil(total_items / params.size)
 
-    return PaginationResponse(
+    response = PaginationResponse[ProductData](
         current_page=params.page,
         size=len(products),
         total_page=total_page,
         total_items=total_items,
         items=products,
     )
+    body = response.model_dump_json().encode()
+    await product_cache.set(cache_key, body, version)
+
+    return json_response(body, etag=etag)
+
+
+@router.get("/cursor", status_code=200, response_model=CursorPaginationResponse[ProductData])
+async def get_products_by_cursor(params: CursorParams = Depends(),
+                                 list_params: ProductListParams = Depends(),
+                                 if_none_match: str | None = Header(default=None),
+                                 session: AsyncSession = Depends(get_read_session)):
+    """(정렬 컬럼, id) 기준 keyset pagination, 페이지 깊이와 무관하게 인덱스로 바로 시작 위치를 찾음"""
+    cache_key = f"cursor:{params.cursor}:{params.size}:{list_params.cache_key}"
+    version, etag = await product_cache.current()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cached = await product_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, etag=etag)
+
+    stmt = apply_filters(select(Product), list_params.min_price, list_params.max_price, list_params.in_stock)
+    stmt = apply_sort(stmt, list_params.sort).limit(params.size + 1)
+
+    if params.after is not None:
+        try:
+            stmt = apply_keyset(stmt, list_params.sort, params.after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid cursor")
+
+    products = (await session.scalars(stmt)).all()
+
+    # size + 1 개를 조회해서 다음 페이지 존재 여부 확인
+    next_cursor = None
+    if len(products) > params.size:
+        products = products[:params.size]
+        next_cursor = encode_cursor(cursor_values(products[-1], list_params.sort))
+
+    response = CursorPaginationResponse[ProductData](
+        size=len(products),
+        next_cursor=next_cursor,
+        items=products,
+    )
+    body = response.model_dump_json().encode()
+    await product_cache.set(cache_key, body, version)
+
+    return json_response(body, etag=etag)
+
+
+@router.get("/search", status_code=200, response_model=CursorPaginationResponse[ProductData])
+async def search_products_by_keyword(q: str = Query(min_length=1, max_length=200, description="search keyword"),
+                                     params: CursorParams = Depends(),
+                                     if_none_match: str | None = Header(default=None),
+                                     session: AsyncSession = Depends(get_read_session)):
+    """이름, 설명 전문 검색 (FTS5), 관련도 순 정렬, 단어별 prefix 일치"""
+    match_query = build_match_query(q)
+    if match_query is None:
+        raise HTTPException(status_code=400, detail="invalid search keyword")
+
+    cache_key = f"search:{match_query}:{params.cursor}:{params.size}"
+    version, etag = await product_cache.current()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cached = await product_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, etag=etag)
+
+    after = None
+    if params.after is not None:
+        last_rank, last_id = params.after.get("rank"), params.after.get("id")
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="invalid cursor")
+        after = (last_rank, last_id)
+
+    rows = await search_products(session, match_query, params.size + 1, after)
+
+    next_cursor = None
+    if len(rows) > params.size:
+        rows = rows[:params.size]
+        last_product, last_rank = rows[-1]
+        next_cursor = encode_cursor({"rank": last_rank, "id": last_product.id})
+
+    response = CursorPaginationResponse[ProductData](
+        size=len(rows),
+        next_cursor=next_cursor,
+        items=[product for product, _ in rows],
+    )
+    body = response.model_dump_json().encode()
+    await product_cache.set(cache_key, body, version)
+
+    return json_response(body, etag=etag)
+
+
+@router.get("/{product_id}", status_code=200, response_model=ProductData)
+async def get_product(product_id: int,
+                      if_none_match: str | None = Header(default=None),
+                      session: AsyncSession = Depends(get_read_session)):
+    cache_key = f"product:{product_id}"
+    version, etag = await product_cache.current()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    cached = await product_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, etag=etag)
+
+    product = await session.get(Product, product_id)
+    if product is None:
+        raise HTTPException(status_code=404, detail="product not found")
+
+    response = ProductData.model_validate(product)
+    body = response.model_dump_json().encode()
+    await product_cache.set(cache_key, body, version)
+
+    return json_response(body, etag=etag)
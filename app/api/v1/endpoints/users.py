@@ -1,33 +1,39 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.params import Depends
-from pwdlib import PasswordHash
 from sqlalchemy import select, exists
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_session
+from app.core.password import password_hasher
+from app.db.session import get_session, get_read_session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserSignupResponse, UserData
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
-password_hash = PasswordHash.recommended()
-
 
 @router.post("/signup", status_code=201)
 async def user_signup(user_create: UserCreate,
-                      session: AsyncSession = Depends(get_session)) -> UserSignupResponse:
+                      session: AsyncSession = Depends(get_session),
+                      read_session: AsyncSession = Depends(get_read_session)) -> UserSignupResponse:
     email = user_create.email
     password = user_create.password
 
+    # 중복 확인과 해싱은 쓰기 연결 밖에서 처리하고 쓰기 연결은 INSERT/commit 동안만 점유
     stmt = select(exists().where(User.email == email))
-    is_exist_email = await session.scalar(stmt)
+    is_exist_email = await read_session.scalar(stmt)
     if is_exist_email:
         raise HTTPException(status_code=400, detail="Email already exists")
 
-    hashed_password = password_hash.hash(password)
+    hashed_password = await password_hasher.hash(password)
     new_user: User = User(email=str(email), hashed_password=hashed_password)
     session.add(new_user)
-    await session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # 확인 이후 동시에 가입된 경우
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Email already exists")
     await session.refresh(new_user)
 
     return UserSignupResponse(user=UserData.model_validate(new_user))
@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+import json
+import sys
+from typing import AsyncIterator
+
+from app.constants.file_format import FileFormat
+from app.core.cache_backend import cache_backend
+from app.core.config import PRODUCT_IMPORT_BATCH_SIZE
+from app.db.migrations import migrate_db
+from app.db.session import AsyncSessionLocal, create_db_and_tables, close_db_connection
+from app.services.product_cache import product_cache
+from app.services.product_import import iter_lines, parse_rows, import_products
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def import_products_command(path: str, file_format: FileFormat, batch_size: int) -> int:
+    """실패, 중복 row report는 stdout에 NDJSON으로 출력, 에러가 있으면 1 반환"""
+    await create_db_and_tables()
+    await migrate_db()
+    summary = {}
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = parse_rows(iter_lines(read_chunks(path)), file_format)
+            async for report in import_products(session, rows, batch_size):
+                if report["status"] == "summary":
+                    summary = report
+                else:
+                    print(json.dumps(report, ensure_ascii=False))
+
+        if summary.get("created"):
+            await product_cache.invalidate()
+    finally:
+        await close_db_connection()
+        await cache_backend.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+    return 1 if summary.get("error", 1) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import-products", help="bulk import products from NDJSON or CSV file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", dest="file_format", type=FileFormat, default=None,
+                               help="ndjson or csv, default: by file extension")
+    import_parser.add_argument("--batch-size", type=int, default=PRODUCT_IMPORT_BATCH_SIZE)
+
+    args = parser.parse_args()
+    if args.command == "import-products":
+        file_format = args.file_format or (FileFormat.CSV if args.path.endswith(".csv") else FileFormat.NDJSON)
+        sys.exit(asyncio.run(import_products_command(args.path, file_format, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class FileFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
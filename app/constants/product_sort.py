@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class ProductSort(Enum):
+    ID = "id"
+    NEWEST = "newest"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    NAME = "name"
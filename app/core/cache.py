@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Hashable, Callable
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거하는 LRU 캐시
+    항목마다 만료 시각(epoch seconds)을 가지며, 동기 의존성(threadpool)에서도 쓰이므로 thread-safe
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, size_of: Callable[[V], int] | None = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # size_of가 주어지면 저장된 값들의 크기 합(bytes)을 추적
+        self.memory_bytes = 0
+        self._size_of = size_of
+        self._items: OrderedDict[K, tuple[V, float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remove(self, key: K):
+        _, _, size = self._items.pop(key)
+        self.memory_bytes -= size
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = item
+            if expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float | None = None):
+        """expires_at이 주어지면 기본 TTL과 비교해 더 이른 시각에 만료"""
+        if self.max_size <= 0:
+            return
+
+        ttl_expires_at = time.time() + self.ttl_seconds
+        expires_at = ttl_expires_at if expires_at is None else min(expires_at, ttl_expires_at)
+        size = self._size_of(value) if self._size_of is not None else 0
+
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (value, expires_at, size)
+            self.memory_bytes += size
+
+            while len(self._items) > self.max_size:
+                self._remove(next(iter(self._items)))
+                self.evictions += 1
+
+    def delete(self, key: K):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.memory_bytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_bytes": self.memory_bytes,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
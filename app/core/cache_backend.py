@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Callable
+
+from redis.asyncio import Redis
+
+from app.core.cache import TTLCache
+from app.core.config import CACHE_BACKEND, REDIS_URL
+
+InvalidateHandler = Callable[[str], None]
+
+
+class CacheBackend(ABC):
+    """worker 프로세스 간 공유 가능한 캐시 저장소 + pub/sub 무효화 채널"""
+
+    # 다른 worker 프로세스와 공유되는 저장소인지, 프로세스 로컬이면 L1 캐시와 같은 값을 중복 저장하지 않음
+    shared = True
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        ...
+
+    @abstractmethod
+    async def set_if_absent(self, key: str, value: bytes) -> bool:
+        """키가 없을 때만 만료 없이 저장, 저장했으면 True"""
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def publish(self, channel: str, message: str):
+        ...
+
+    @abstractmethod
+    async def subscribe(self, channel: str, handler: InvalidateHandler):
+        ...
+
+    async def close(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """단일 프로세스용 (개발, 테스트), pub/sub은 같은 프로세스 안에서만 전달됨"""
+
+    shared = False
+
+    def __init__(self, max_size: int = 10000):
+        self._items: TTLCache[str, bytes] = TTLCache(max_size=max_size, ttl_seconds=float("inf"))
+        self._counters: dict[str, int] = defaultdict(int)
+        self._handlers: dict[str, list[InvalidateHandler]] = defaultdict(list)
+
+    async def get(self, key: str) -> bytes | None:
+        counter = self._counters.get(key)
+        if counter is not None:
+            return str(counter).encode()
+        return self._items.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        self._items.set(key, value, expires_at=expires_at)
+
+    async def set_if_absent(self, key: str, value: bytes) -> bool:
+        if await self.get(key) is not None:
+            return False
+        self._items.set(key, value, expires_at=None)
+        return True
+
+    async def delete(self, key: str):
+        self._items.delete(key)
+        self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] += 1
+        return self._counters[key]
+
+    async def publish(self, channel: str, message: str):
+        for handler in self._handlers[channel]:
+            handler(message)
+
+    async def subscribe(self, channel: str, handler: InvalidateHandler):
+        self._handlers[channel].append(handler)
+
+
+class RedisCacheBackend(CacheBackend):
+    """여러 worker 프로세스가 공유하는 Redis (또는 Redis 프로토콜 호환 서버) 저장소"""
+
+    def __init__(self, redis: Redis):
+        self._redis = redis
+        self._listeners: list[asyncio.Task] = []
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int):
+        await self._redis.set(key, value, ex=ttl_seconds or None)
+
+    async def set_if_absent(self, key: str, value: bytes) -> bool:
+        return bool(await self._redis.set(key, value, nx=True))
+
+    async def delete(self, key: str):
+        await self._redis.delete(key)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+    async def publish(self, channel: str, message: str):
+        await self._redis.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: InvalidateHandler):
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+        self._listeners.append(asyncio.create_task(self._listen(pubsub, handler)))
+
+    @staticmethod
+    async def _listen(pubsub, handler: InvalidateHandler):
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                handler(message["data"].decode())
+            except Exception:
+                logging.exception("failed to handle cache invalidation message")
+
+    async def close(self):
+        for listener in self._listeners:
+            listener.cancel()
+        await self._redis.aclose()
+
+
+def create_cache_backend() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(Redis.from_url(REDIS_URL))
+    return MemoryCacheBackend()
+
+
+cache_backend = create_cache_backend()
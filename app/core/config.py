@@ -4,6 +4,24 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# database
+DATABASE_URL = os.getenv("DATABASE_URL")
+# 파일 sqlite 이외의 DB 연결 pool 크기
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+# 파일 sqlite는 쓰기가 한 번에 하나만 가능하므로 쓰기 연결은 기본 1개로 직렬화
+DB_WRITE_POOL_SIZE = int(os.getenv("DB_WRITE_POOL_SIZE", "1"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "3600"))
+# sqlite 연결 시 적용할 PRAGMA, 빈 값이면 적용하지 않음
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-64000"),
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
 # jwt
 ACCESS_TOKEN_SECRET = os.getenv("ACCESS_TOKEN_SECRET")
 REFRESH_TOKEN_SECRET = os.getenv("REFRESH_TOKEN_SECRET")
@@ -11,3 +29,41 @@ ACCESS_TOKEN_EXPIRED_TIME_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRED_TIME_MIN
 REFRESH_TOKEN_EXPIRED_TIME_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRED_TIME_DAYS"))
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
 TOKEN_ISSUER = os.getenv("TOKEN_ISSUER")
+# 유저별 동시 로그인(기기) 수, 초과하면 가장 오래된 세션부터 만료
+REFRESH_TOKEN_MAX_SESSIONS = int(os.getenv("REFRESH_TOKEN_MAX_SESSIONS", "5"))
+# 교체 직후 이전 토큰으로 들어온 동시 refresh 요청을 재사용으로 보지 않는 시간, 현재 토큰을 다시 응답
+REFRESH_TOKEN_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_TOKEN_REUSE_GRACE_SECONDS", "5"))
+
+# counter
+COUNT_RECONCILE_INTERVAL_SECONDS = int(os.getenv("COUNT_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+# sweeper
+SWEEP_INTERVAL_SECONDS = int(os.getenv("SWEEP_INTERVAL_SECONDS", "600"))
+# 한 트랜잭션에서 삭제할 최대 row 수, 쓰기 lock을 오래 잡지 않도록 작게 유지
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE", "500"))
+CART_IDLE_DAYS = int(os.getenv("CART_IDLE_DAYS", "30"))
+
+# product import / export
+# 한 트랜잭션(executemany)으로 insert할 상품 수
+PRODUCT_IMPORT_BATCH_SIZE = int(os.getenv("PRODUCT_IMPORT_BATCH_SIZE", "1000"))
+# export 시 DB cursor에서 한 번에 가져와서 응답으로 보낼 row 수
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# cache
+# memory: 프로세스별 캐시, redis: 여러 worker가 공유하는 캐시 (REDIS_URL)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", "1000"))
+# 무효화 메시지가 유실되어도 TTL 이후에는 반영됨
+PRODUCT_CACHE_TTL_SECONDS = int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "30"))
+
+# password hashing
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+# group commit
+DB_GROUP_COMMIT_ENABLED = os.getenv("DB_GROUP_COMMIT_ENABLED", "false").lower() == "true"
+DB_GROUP_COMMIT_DELAY_MS = int(os.getenv("DB_GROUP_COMMIT_DELAY_MS", "2"))
+DB_GROUP_COMMIT_MAX_BATCH = int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", "64"))
@@ -1,9 +1,14 @@
 from fastapi import HTTPException
 from fastapi.params import Cookie
 
+from app.core.cache import TTLCache
+from app.core.config import TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS
 from app.core.security import verify_access_token
 from app.schemas.user import UserData
 
+# 검증이 끝난 access token -> UserData, 토큰 만료 시각 이후로는 캐시되지 않음
+token_cache: TTLCache[str, UserData] = TTLCache(max_size=TOKEN_CACHE_SIZE, ttl_seconds=TOKEN_CACHE_TTL_SECONDS)
+
 
 def get_current_user(access_token: str = Cookie(None)):
     if not access_token:
@@ -12,11 +17,18 @@ def get_current_user(access_token: str = Cookie(None)):
             detail="Token missing in cookie"
         )
 
+    user = token_cache.get(access_token)
+    if user is not None:
+        return user
+
     payload = verify_access_token(access_token)
 
-    return UserData(
+    user = UserData(
         id=payload.sub,
         email=payload.user.email,
         role=payload.user.role,
         is_active=True
     )
+    token_cache.set(access_token, user, expires_at=payload.exp.timestamp())
+
+    return user
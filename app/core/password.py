@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from pwdlib import PasswordHash
+
+from app.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT
+
+password_hash = PasswordHash.recommended()
+
+
+class PasswordHasher:
+    """
+    argon2 해싱/검증을 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않음 (argon2는 연산 중 GIL을 해제)
+    실행 중 + 대기 중인 작업이 workers + queue_limit 를 넘으면 503 응답
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.capacity = workers + queue_limit
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+
+    async def _run(self, fn, *args):
+        # in_flight는 이벤트 루프 스레드에서만 변경됨
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Server is busy, try again later",
+                                headers={"Retry-After": "1"})
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(password_hash.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(password_hash.verify, password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(workers=PASSWORD_HASH_WORKERS, queue_limit=PASSWORD_HASH_QUEUE_LIMIT)
@@ -1,3 +1,5 @@
+import hashlib
+import uuid
 from datetime import datetime, timezone, timedelta
 
 import jwt
@@ -6,7 +8,7 @@ from fastapi import HTTPException, status
 from app.constants.role import Role
 from app.core.config import ACCESS_TOKEN_SECRET, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRED_TIME_MINUTES, TOKEN_ISSUER, REFRESH_TOKEN_EXPIRED_TIME_DAYS, \
     REFRESH_TOKEN_SECRET
-from app.core.types.Payload import Payload, UserPayload
+from app.core.types.Payload import Payload, UserPayload, RefreshPayload
 from app.schemas.user import UserData
 
 
@@ -54,10 +56,25 @@ def verify_access_token(token: str) -> Payload:
         )
 
 
-def create_refresh_token(user_id: int) -> str:
-    expired_at = datetime.now(tz=timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRED_TIME_DAYS)
+def refresh_token_expires_at() -> datetime:
+    return datetime.now(tz=timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRED_TIME_DAYS)
+
+
+def create_refresh_token(user: UserData, family_id: str) -> str:
+    """
+    refresh 시 User 조회 없이 access token을 발급할 수 있도록 user claim 포함
+    family_id: signin 한 번으로 시작되는 rotation 계열, 재사용 감지 시 계열 전체 폐기
+    """
+    expired_at = refresh_token_expires_at()
     payload = {
-        "sub": str(user_id),
+        "sub": str(user.id),
+        "user": {
+            "email": user.email,
+            "role": user.role.name
+        },
+        "fid": family_id,
+        # 같은 초에 발급되어도 토큰(hash)이 겹치지 않도록
+        "jti": uuid.uuid4().hex,
         "exp": expired_at,
         "iss": TOKEN_ISSUER,
         "iat": datetime.now(tz=timezone.utc)
@@ -66,9 +83,18 @@ def create_refresh_token(user_id: int) -> str:
     return jwt.encode(payload, REFRESH_TOKEN_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def verify_refresh_token(token: str):
+def verify_refresh_token(token: str) -> RefreshPayload:
     try:
-        return jwt.decode(token, REFRESH_TOKEN_SECRET, algorithms=JWT_ALGORITHM)
+        decoded = jwt.decode(token, REFRESH_TOKEN_SECRET, algorithms=JWT_ALGORITHM)
+        return RefreshPayload(
+            sub=int(decoded.get("sub")),
+            user=UserPayload(email=decoded.get("user").get("email"),
+                             role=Role(decoded.get("user").get("role"))),
+            fid=decoded.get("fid"),
+            exp=datetime.fromtimestamp(int(decoded.get("exp")), tz=timezone.utc),
+            iss=decoded.get("iss"),
+            iat=datetime.fromtimestamp(int(decoded.get("iat")), tz=timezone.utc)
+        )
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -84,3 +110,12 @@ def verify_refresh_token(token: str):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+
+
+def new_token_family() -> str:
+    return uuid.uuid4().hex
+
+
+def hash_token(token: str) -> str:
+    """DB에는 토큰 원문 대신 고정 길이 sha256 hash 저장"""
+    return hashlib.sha256(token.encode()).hexdigest()
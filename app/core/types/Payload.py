@@ -16,3 +16,12 @@ class Payload(BaseModel):
     exp: datetime
     iss: str
     iat: datetime
+
+
+class RefreshPayload(BaseModel):
+    sub: int
+    user: UserPayload
+    fid: str
+    exp: datetime
+    iss: str
+    iat: datetime
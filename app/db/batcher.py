@@ -0,0 +1,103 @@
+import asyncio
+from typing import Callable, Awaitable, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import DB_GROUP_COMMIT_ENABLED, DB_GROUP_COMMIT_DELAY_MS, DB_GROUP_COMMIT_MAX_BATCH
+from app.db.session import AsyncSessionLocal
+
+T = TypeVar("T")
+Work = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteBatcher:
+    """
+    짧은 시간 안에 들어온 작은 쓰기 작업들을 하나의 트랜잭션으로 모아 commit 1번으로 처리 (group commit)
+    각 작업은 SAVEPOINT 안에서 실행되어 실패한 작업만 롤백되고, 결과/예외는 작업을 제출한 요청에 각각 전달됨
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, max_delay_seconds: float, max_batch_size: int):
+        self.max_delay_seconds = max_delay_seconds
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.works = 0
+        self._session_factory = session_factory
+        self._pending: list[tuple[Work, asyncio.Future]] = []
+        self._flusher: asyncio.Task | None = None
+
+    async def submit(self, work: Work[T]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((work, future))
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+        return await future
+
+    async def _flush_loop(self):
+        # commit 중에 들어온 작업은 다음 배치로 묶임
+        while self._pending:
+            if len(self._pending) < self.max_batch_size:
+                await asyncio.sleep(self.max_delay_seconds)
+
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:len(batch)]
+            await self._commit_batch(batch)
+
+    async def _commit_batch(self, batch: list[tuple[Work, asyncio.Future]]):
+        results = []
+        try:
+            async with self._session_factory() as session:
+                if session.bind.dialect.name == "sqlite":
+                    # pysqlite는 SAVEPOINT 전에 BEGIN을 보내지 않으므로 직접 트랜잭션 시작
+                    await session.execute(text("BEGIN IMMEDIATE"))
+
+                for work, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            results.append((future, await work(session), None))
+                    except Exception as e:
+                        results.append((future, None, e))
+
+                await session.commit()
+        except Exception as e:
+            # commit 실패 시 배치 전체 실패
+            results = [(future, None, e) for _, future in batch]
+
+        self.batches += 1
+        self.works += len(batch)
+        for future, result, error in results:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "works": self.works,
+            "pending": len(self._pending),
+        }
+
+
+write_batcher: WriteBatcher | None = None
+if DB_GROUP_COMMIT_ENABLED:
+    write_batcher = WriteBatcher(AsyncSessionLocal,
+                                 max_delay_seconds=DB_GROUP_COMMIT_DELAY_MS / 1000,
+                                 max_batch_size=DB_GROUP_COMMIT_MAX_BATCH)
+
+
+async def commit_write(session: AsyncSession, work: Work[T]) -> T:
+    """
+    work 실행 후 commit, group commit이 켜져 있으면 다른 요청의 작업과 묶어서 commit
+    요청 세션이 이미 연결을 점유하고 있으면 (쓰기 연결이 하나뿐이므로) 묶지 않고 바로 실행
+    """
+    if write_batcher is None or session.in_transaction():
+        result = await work(session)
+        await session.commit()
+        return result
+
+    return await write_batcher.submit(work)
@@ -0,0 +1,185 @@
+import logging
+
+from sqlalchemy import Connection, inspect, text
+
+from app.core.config import REFRESH_TOKEN_EXPIRED_TIME_DAYS
+from app.db.session import engine, Base
+from app.models.product import SEARCH_TABLE
+from app.utils.normalize_name import normalize_name
+
+
+def _merge_duplicate_cart_items(conn: Connection):
+    """unique 인덱스 생성 전 같은 장바구니의 중복 상품을 가장 오래된 row로 합침"""
+    index_names = {index["name"] for index in inspect(conn).get_indexes("cart_items")}
+    if "ux_cart_items_cart_id_product_id" in index_names:
+        return
+
+    conn.execute(text(
+        "UPDATE cart_items SET quantity = ("
+        "  SELECT sum(dup.quantity) FROM cart_items AS dup"
+        "  WHERE dup.cart_id = cart_items.cart_id AND dup.product_id = cart_items.product_id) "
+        "WHERE id IN (SELECT min(id) FROM cart_items GROUP BY cart_id, product_id HAVING count(*) > 1)"
+    ))
+    result = conn.execute(text(
+        "DELETE FROM cart_items "
+        "WHERE id NOT IN (SELECT min(id) FROM cart_items GROUP BY cart_id, product_id)"
+    ))
+    if result.rowcount:
+        logging.info(f"merged {result.rowcount} duplicated cart items")
+
+
+def _add_column_if_missing(conn: Connection, table_name: str, column_name: str, column_ddl: str) -> bool:
+    column_names = {column["name"] for column in inspect(conn).get_columns(table_name)}
+    if column_name in column_names:
+        return False
+
+    conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_ddl}"))
+    logging.info(f"added column {table_name}.{column_name}")
+    return True
+
+
+def _backfill_order_item_product_name(conn: Connection):
+    """기존 주문 아이템에 현재 상품 이름으로 스냅샷 채움"""
+    if not _add_column_if_missing(conn, "order_items", "product_name", "VARCHAR NOT NULL DEFAULT ''"):
+        return
+
+    conn.execute(text(
+        "UPDATE order_items SET product_name = ("
+        "  SELECT products.name FROM products WHERE products.id = order_items.product_id) "
+        "WHERE EXISTS (SELECT 1 FROM products WHERE products.id = order_items.product_id)"
+    ))
+
+
+def _backfill_product_normalized_name(conn: Connection, batch_size: int = 1000):
+    if not _add_column_if_missing(conn, "products", "normalized_name", "VARCHAR NOT NULL DEFAULT ''"):
+        return
+
+    # normalize_name은 SQL로 표현할 수 없으므로 python에서 계산
+    stmt = text("UPDATE products SET normalized_name = :normalized_name WHERE id = :product_id")
+    last_id = 0
+    while True:
+        rows = conn.execute(text("SELECT id, name FROM products WHERE id > :last_id ORDER BY id LIMIT :limit"),
+                            {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+
+        conn.execute(stmt, [{"normalized_name": normalize_name(name), "product_id": product_id}
+                            for product_id, name in rows])
+        last_id = rows[-1][0]
+
+
+def _rename_duplicate_product_names(conn: Connection):
+    """
+    unique 인덱스 생성 전 정규화된 이름이 같은 상품 중 가장 오래된 상품을 제외하고 이름 뒤에 id를 붙임
+    주문 아이템이 상품을 참조하므로 합치거나 삭제하지 않음
+    """
+    index_names = {index["name"] for index in inspect(conn).get_indexes("products")}
+    if "ux_products_normalized_name" in index_names:
+        return
+
+    result = conn.execute(text(
+        "UPDATE products SET name = name || ' (' || id || ')', "
+        "  normalized_name = normalized_name || ' (' || id || ')' "
+        "WHERE id NOT IN (SELECT min(id) FROM products GROUP BY normalized_name)"
+    ))
+    if result.rowcount:
+        logging.warning(f"renamed {result.rowcount} products with duplicated name")
+
+
+def _add_cart_revision(conn: Connection):
+    _add_column_if_missing(conn, "carts", "revision", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _backfill_cart_updated_at(conn: Connection):
+    # sqlite의 ADD COLUMN은 CURRENT_TIMESTAMP 기본값을 허용하지 않으므로 추가 후 채움
+    if _add_column_if_missing(conn, "carts", "updated_at", "DATETIME"):
+        conn.execute(text("UPDATE carts SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL"))
+
+
+def _backfill_refresh_token_expires_at(conn: Connection):
+    """마지막 발급(rotation) 시각 기준으로 만료 시각 계산"""
+    if _add_column_if_missing(conn, "refresh_token", "expires_at", "DATETIME"):
+        conn.execute(text(
+            "UPDATE refresh_token SET expires_at = datetime(coalesce(updated_at, created_at), :days) "
+            "WHERE expires_at IS NULL"
+        ), {"days": f"+{REFRESH_TOKEN_EXPIRED_TIME_DAYS} days"})
+
+
+def _add_refresh_token_rotation_columns(conn: Connection):
+    _add_column_if_missing(conn, "refresh_token", "previous_token_hash", "VARCHAR(64)")
+    _add_column_if_missing(conn, "refresh_token", "rotated_at", "DATETIME")
+
+
+def _recreate_refresh_token_table(conn: Connection):
+    """
+    원문 토큰을 저장하던 테이블은 hash, family로 변환할 수 없으므로 새로 생성
+    기존 refresh token은 claim 형식도 달라 어차피 사용할 수 없음, 사용자는 다시 signin 필요
+    """
+    column_names = {column["name"] for column in inspect(conn).get_columns("refresh_token")}
+    if "token_hash" in column_names:
+        return
+
+    table = Base.metadata.tables["refresh_token"]
+    table.drop(conn)
+    table.create(conn)
+    logging.info("recreated refresh_token table, existing sessions are signed out")
+
+
+def _drop_refresh_token_user_unique(conn: Connection):
+    """
+    여러 기기 동시 로그인을 위해 user_id unique 제약 제거
+    sqlite는 제약을 바로 제거할 수 없으므로 임시 테이블로 복사 후 테이블 재생성
+    """
+    unique_columns = [constraint["column_names"] for constraint in inspect(conn).get_unique_constraints("refresh_token")]
+    if ["user_id"] not in unique_columns:
+        return
+
+    table = Base.metadata.tables["refresh_token"]
+    conn.execute(text("CREATE TEMP TABLE refresh_token_backup AS SELECT * FROM refresh_token"))
+    table.drop(conn)
+    table.create(conn)
+    columns = ", ".join(column.name for column in table.columns)
+    conn.execute(text(f"INSERT INTO refresh_token ({columns}) SELECT {columns} FROM refresh_token_backup"))
+    conn.execute(text("DROP TABLE refresh_token_backup"))
+    logging.info("rebuilt refresh_token table without unique user_id")
+
+
+def _rebuild_product_search_index(conn: Connection):
+    """검색 인덱스가 기존 상품보다 나중에 생성된 경우 products 테이블 기준으로 재생성"""
+    is_missing = conn.scalar(text(
+        f"SELECT EXISTS (SELECT 1 FROM products) AND NOT EXISTS (SELECT 1 FROM {SEARCH_TABLE}_docsize)"
+    ))
+    if is_missing:
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('rebuild')"))
+        logging.info("rebuilt product search index")
+
+
+def _create_missing_indexes(conn: Connection):
+    """create_all은 이미 존재하는 테이블의 인덱스를 만들지 않으므로 누락된 인덱스 생성"""
+    # unique 인덱스 대상 중복 데이터는 앞 단계에서 정리, 그래도 실패하면 시작하지 않음 (IntegrityError)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _migrate(conn: Connection):
+    _merge_duplicate_cart_items(conn)
+    _backfill_order_item_product_name(conn)
+    _backfill_product_normalized_name(conn)
+    # 이름 변경 시 검색 인덱스 trigger가 기존 인덱스 항목을 삭제하므로 인덱스를 먼저 채움
+    _rebuild_product_search_index(conn)
+    _rename_duplicate_product_names(conn)
+    _add_cart_revision(conn)
+    _recreate_refresh_token_table(conn)
+    # 테이블 재생성 시 현재 모델의 컬럼을 모두 복사하므로 컬럼 추가가 먼저
+    _backfill_refresh_token_expires_at(conn)
+    _add_refresh_token_rotation_columns(conn)
+    _drop_refresh_token_user_unique(conn)
+    _backfill_cart_updated_at(conn)
+    _create_missing_indexes(conn)
+
+
+async def migrate_db():
+    """create_db_and_tables 이후 실행, 기존 DB를 현재 모델에 맞게 갱신 (여러 번 실행해도 안전)"""
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate)
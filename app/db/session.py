@@ -1,32 +1,88 @@
-import os
+from functools import partial
 
-from click import echo
-from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
 from sqlalchemy.orm import MappedAsDataclass, DeclarativeBase
 
-load_dotenv()
+from app.core.config import DATABASE_URL, DB_POOL_SIZE, DB_WRITE_POOL_SIZE, DB_READ_POOL_SIZE, DB_POOL_TIMEOUT, \
+    SQLITE_PRAGMAS
 
 
 class Base(DeclarativeBase):
     pass
 
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 # Base = declarative_base()
 
-engine = create_async_engine(url=DATABASE_URL,
-                             pool_pre_ping=True,
-                             pool_size=20,
-                             pool_timeout=3600,
-                             # echo=True,
-                             connect_args={"check_same_thread": False})
+
+def is_sqlite_file(url: str) -> bool:
+    url = make_url(url)
+    return (url.get_backend_name() == "sqlite"
+            and url.database not in (None, "", ":memory:")
+            and url.query.get("mode") != "memory")
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record, pragmas: dict):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        if value:
+            cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _pool_options(url: str, pool_size: int | None) -> dict:
+    backend = make_url(url).get_backend_name()
+    if is_sqlite_file(url):
+        # 파일 sqlite는 쓰기가 한 번에 하나만 가능하므로 연결 수를 고정하고 checkout 대기로 직렬화
+        return {"pool_size": pool_size or DB_WRITE_POOL_SIZE, "max_overflow": 0, "pool_timeout": DB_POOL_TIMEOUT}
+    if backend == "sqlite":
+        # 메모리 sqlite는 연결 하나를 공유하는 기본 pool(StaticPool) 사용
+        return {}
+    return {"pool_size": pool_size or DB_POOL_SIZE, "pool_timeout": DB_POOL_TIMEOUT}
+
+
+def create_engine(url: str, pool_size: int | None = None, pragmas: dict = SQLITE_PRAGMAS) -> AsyncEngine:
+    # 파일 sqlite는 끊어질 연결이 없으므로 pre ping 불필요 (checkout 마다 왕복 1회 절약)
+    new_engine = create_async_engine(url=url,
+                                     pool_pre_ping=not is_sqlite_file(url),
+                                     # echo=True,
+                                     connect_args={"check_same_thread": False},
+                                     **_pool_options(url, pool_size))
+
+    if make_url(url).get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", partial(_set_sqlite_pragmas, pragmas=pragmas))
+
+    return new_engine
+
+
+def create_read_engine(url: str, write_engine: AsyncEngine) -> AsyncEngine:
+    """파일 sqlite는 읽기 전용 연결 풀을 따로 만들어 쓰기 락을 기다리지 않게 함, 그 외에는 쓰기 엔진 공유"""
+    if not is_sqlite_file(url):
+        return write_engine
+
+    url = make_url(url)
+    read_url = url.set(database=f"file:{url.database}", query={**url.query, "mode": "ro", "uri": "true"})
+    # journal mode 변경은 쓰기 연결에서만 가능
+    read_pragmas = {name: value for name, value in SQLITE_PRAGMAS.items() if name != "journal_mode"}
+
+    return create_engine(read_url.render_as_string(hide_password=False),
+                         pool_size=DB_READ_POOL_SIZE,
+                         pragmas=read_pragmas)
+
+
+engine = create_engine(DATABASE_URL)
+read_engine = create_read_engine(DATABASE_URL, engine)
 
 AsyncSessionLocal = async_sessionmaker(bind=engine,
                                        autocommit=False,
                                        autoflush=False,
                                        expire_on_commit=False)
 
+ReadSessionLocal = async_sessionmaker(bind=read_engine,
+                                      autocommit=False,
+                                      autoflush=False,
+                                      expire_on_commit=False)
+
 
 async def get_session():
     async with AsyncSessionLocal() as session:
@@ -39,10 +95,18 @@ async def get_session():
             await session.close()
 
 
+async def get_read_session():
+    """조회 전용 엔드포인트용 세션, 쓰기 연결과 분리되어 있어 쓰기 트랜잭션을 기다리지 않음"""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 async def create_db_and_tables():
-    async with engine.connect() as conn:
+    async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def close_db_connection():
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -5,13 +6,29 @@ from fastapi import FastAPI
 from fastapi_pagination import add_pagination
 
 from app.api.v1.api import router
-from app.db.session import create_db_and_tables
+from app.core.cache_backend import cache_backend
+from app.core.config import COUNT_RECONCILE_INTERVAL_SECONDS, SWEEP_INTERVAL_SECONDS
+from app.core.password import password_hasher
+from app.db.migrations import migrate_db
+from app.db.session import create_db_and_tables, close_db_connection
+from app.services.counter import run_count_reconciler
+from app.services.product_cache import product_cache
+from app.services.sweeper import sweeper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_db_and_tables()
+    await migrate_db()
+    await product_cache.start()
+    reconciler = asyncio.create_task(run_count_reconciler(COUNT_RECONCILE_INTERVAL_SECONDS))
+    sweeper_task = asyncio.create_task(sweeper.run(SWEEP_INTERVAL_SECONDS))
     yield
+    reconciler.cancel()
+    sweeper_task.cancel()
+    password_hasher.shutdown()
+    await close_db_connection()
+    await cache_backend.close()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -5,3 +5,4 @@ from .cart import Cart
 from .cart_item import CartItem
 from .order import Order
 from .order_item import OrderItem
+from .entity_count import EntityCount
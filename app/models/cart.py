@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, func
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from ..db.session import Base
@@ -14,6 +15,10 @@ class Cart(Base):
     __tablename__ = "carts"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey(column="users.id", ondelete="CASCADE"), unique=True)
+    # 장바구니가 변경될 때마다 증가, ETag 생성에 사용
+    revision: Mapped[int] = mapped_column(nullable=False, default=0)
+    # 오래 사용하지 않은 장바구니 정리 기준
+    updated_at: Mapped[datetime] = mapped_column(default=func.now(), onupdate=func.now(), index=True)
 
     user: Mapped["User"] = relationship()
     items: Mapped[List["CartItem"]] = relationship(lazy="selectin", cascade="all, delete-orphan")
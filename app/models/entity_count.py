@@ -0,0 +1,33 @@
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.session import Base
+
+# row 수를 트리거로 유지하는 테이블 목록
+COUNTED_TABLES = ("products",)
+
+
+class EntityCount(Base):
+    """테이블별 row 수 카운터, 목록 조회 시 COUNT(*) 대신 사용"""
+    __tablename__ = "entity_counts"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+def _counter_ddl(table_name: str) -> list[DDL]:
+    return [
+        # 카운터 row가 없을 때만 현재 row 수로 초기화
+        DDL(f"INSERT OR IGNORE INTO entity_counts (name, count) "
+            f"SELECT '{table_name}', count(*) FROM {table_name}"),
+        DDL(f"CREATE TRIGGER IF NOT EXISTS {table_name}_count_insert AFTER INSERT ON {table_name} "
+            f"BEGIN UPDATE entity_counts SET count = count + 1 WHERE name = '{table_name}'; END"),
+        DDL(f"CREATE TRIGGER IF NOT EXISTS {table_name}_count_delete AFTER DELETE ON {table_name} "
+            f"BEGIN UPDATE entity_counts SET count = count - 1 WHERE name = '{table_name}'; END"),
+    ]
+
+
+# metadata after_create는 테이블이 이미 존재해도 create_all 마다 호출되므로 기존 DB에도 트리거가 생성됨
+for _table_name in COUNTED_TABLES:
+    for _ddl in _counter_ddl(_table_name):
+        event.listen(Base.metadata, "after_create", _ddl.execute_if(dialect="sqlite"))
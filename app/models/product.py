@@ -1,12 +1,57 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index, DDL, event
+from sqlalchemy.orm import validates
 
 from app.db.session import Base
+from app.utils.normalize_name import normalize_name
+
+
+def _default_normalized_name(context) -> str:
+    return normalize_name(context.get_current_parameters()["name"])
 
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ux_products_normalized_name", "normalized_name", unique=True),
+        # 가격순, 이름순 정렬 + keyset pagination
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_name_id", "name", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String, nullable=False)
+    # 중복 상품명 검사용, trim 등 함수 적용 없이 인덱스로 조회하기 위해 저장
+    normalized_name = Column(String, nullable=False, default=_default_normalized_name)
     description = Column(String, nullable=False)
     price = Column(Integer, nullable=False)
     quantity = Column(Integer, nullable=False)
+
+    @validates("name")
+    def _set_normalized_name(self, key, name):
+        self.normalized_name = normalize_name(name)
+        return name
+
+
+# 상품 이름, 설명 전문 검색용 FTS5 인덱스, 내용은 products 테이블을 참조 (external content)
+# prefix: 2, 3글자 prefix 인덱스를 따로 유지해서 짧은 검색어의 prefix 검색 비용을 줄임
+SEARCH_TABLE = "products_fts"
+
+_SEARCH_DDL = [
+    DDL(f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+        f"name, description, content='products', content_rowid='id', tokenize='unicode61 remove_diacritics 2', "
+        f"prefix='2 3')"),
+    DDL(f"CREATE TRIGGER IF NOT EXISTS products_search_insert AFTER INSERT ON products "
+        f"BEGIN INSERT INTO {SEARCH_TABLE} (rowid, name, description) VALUES (new.id, new.name, new.description); END"),
+    DDL(f"CREATE TRIGGER IF NOT EXISTS products_search_delete AFTER DELETE ON products "
+        f"BEGIN INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, old.description); END"),
+    # 재고, 가격 변경 시에는 인덱스를 갱신하지 않도록 이름, 설명 변경에만 반응
+    DDL(f"CREATE TRIGGER IF NOT EXISTS products_search_update AFTER UPDATE OF name, description ON products "
+        f"BEGIN INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}, rowid, name, description) "
+        f"VALUES ('delete', old.id, old.name, old.description); "
+        f"INSERT INTO {SEARCH_TABLE} (rowid, name, description) VALUES (new.id, new.name, new.description); END"),
+]
+
+for _ddl in _SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", _ddl.execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "before_drop", DDL(f"DROP TABLE IF EXISTS {SEARCH_TABLE}").execute_if(dialect="sqlite"))
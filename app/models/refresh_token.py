@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, String, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.session import Base
@@ -9,10 +9,21 @@ from app.models import User
 
 class RefreshToken(Base):
     __tablename__ = "refresh_token"
+    __table_args__ = (
+        # 유저별 세션 수 제한 시 오래된 세션 조회
+        Index("ix_refresh_token_user_id_created_at", "user_id", "created_at"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey(column="users.id", ondelete="CASCADE"), unique=True, nullable=False)
-    token: Mapped[str] = mapped_column(nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey(column="users.id", ondelete="CASCADE"), nullable=False)
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(default=func.now())
     updated_at: Mapped[datetime] = mapped_column(onupdate=func.now(), nullable=True)
+    # 현재 토큰의 만료 시각, 만료된 세션 정리 기준
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+    # 직전 토큰 hash와 교체 시각, 교체 직후 같은 토큰으로 들어온 동시 요청을 재사용과 구분
+    previous_token_hash: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
+    rotated_at: Mapped[datetime] = mapped_column(nullable=True)
 
     user: Mapped["User"] = relationship()
@@ -26,5 +26,7 @@ class CartResponse(BaseModel):
     id: int
     items: List[CartItemResponse]
     total_price: float = 0
+    # 담긴 상품 수량 합계
+    item_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
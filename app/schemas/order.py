@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List
 
-from pydantic import BaseModel, ConfigDict, Field, AliasPath
+from pydantic import BaseModel, ConfigDict
 
 from app.constants.order_status import OrderStatus
 
@@ -13,7 +13,7 @@ class OrderCreate(BaseModel):
 class OrderItemResponse(BaseModel):
     id: int
     product_id: int
-    product_name: str = Field(validation_alias=AliasPath("product", "name"))
+    product_name: str
     order_price: int
     quantity: int
 
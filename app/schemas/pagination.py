@@ -1,8 +1,11 @@
 from typing import List, Generic, TypeVar
 
+from fastapi import HTTPException
 from fastapi.params import Query
 from pydantic import BaseModel, Field
 
+from app.utils.cursor import decode_cursor
+
 T = TypeVar("T")
 
 
@@ -12,22 +15,35 @@ class PaginationResponse(BaseModel, Generic[T]):
     total_page: int = Field(description="total page")
     total_items: int = Field(description="total items size")
     items: List[T] = Field(description="data list")
-    # order_by: str | None = Field(default=None, description="get list by")
+
+
+class CursorPaginationResponse(BaseModel, Generic[T]):
+    size: int = Field(description="size of current page")
+    next_cursor: str | None = Field(default=None, description="cursor of next page, null if last page")
+    items: List[T] = Field(description="data list")
 
 
 class PageParams:
     def __init__(self,
                  page: int = Query(1, ge=1, description="page number"),
                  size: int = Query(50, ge=1, le=100, description="size per page"),
-                 # order_by: T2 = Query(None, description="get list by")
                  ):
         self.page = page
         self.size = size
 
 
-class PageParamsWithOrder(PageParams):
-    def __init__(self):
-        super().__init__()
-        raise NotImplementedError()
+class CursorParams:
+    def __init__(self,
+                 after: str | None = Query(None, description="next_cursor of previous page"),
+                 size: int = Query(50, ge=1, le=100, description="size per page"),
+                 ):
+        self.size = size
+        self.cursor = after
+        self.after: dict | None = None
+
+        if after is not None:
+            try:
+                self.after = decode_cursor(after)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="invalid cursor")
 
-    pass
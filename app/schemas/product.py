@@ -1,7 +1,9 @@
 import decimal
 
+from fastapi.params import Query
 from pydantic import Field
 
+from app.constants.product_sort import ProductSort
 from app.schemas.base_schema import BaseSchema
 
 
@@ -18,3 +20,24 @@ class ProductCreate(ProductBase):
 
 class ProductData(ProductBase):
     id: int
+
+
+class ProductListParams:
+    def __init__(self,
+                 min_price: int | None = Query(None, ge=0, description="minimum price"),
+                 max_price: int | None = Query(None, ge=0, description="maximum price"),
+                 in_stock: bool = Query(False, description="only products in stock"),
+                 sort: ProductSort = Query(ProductSort.ID, description="sort order"),
+                 ):
+        self.min_price = min_price
+        self.max_price = max_price
+        self.in_stock = in_stock
+        self.sort = sort
+
+    @property
+    def is_filtered(self) -> bool:
+        return self.min_price is not None or self.max_price is not None or self.in_stock
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.min_price}:{self.max_price}:{self.in_stock}:{self.sort.value}"
@@ -0,0 +1,82 @@
+from typing import Iterable
+
+from sqlalchemy import select, literal, func, Select, Insert
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+
+from app.models import Cart, CartItem, Product
+
+
+def cart_revision_query(user_id: int) -> Select:
+    """ETag 계산용 (장바구니 id, revision), carts.user_id unique 인덱스 사용"""
+    return select(Cart.id, Cart.revision).where(Cart.user_id == user_id)
+
+
+def cart_items_query(cart_id: int) -> Select:
+    """아이템, 상품을 JOIN 한 번으로 조회하고 합계(가격, 수량)는 window 함수로 같은 쿼리에서 계산"""
+    return (
+        select(CartItem,
+               func.sum(Product.price * CartItem.quantity).over(),
+               func.sum(CartItem.quantity).over())
+        .join(CartItem.product)
+        .options(contains_eager(CartItem.product))
+        .where(CartItem.cart_id == cart_id)
+        .order_by(CartItem.id)
+    )
+
+
+def product_stocks_query(product_ids: Iterable[int]) -> Select:
+    """(상품 id, 재고) 목록, 상품 존재와 재고를 IN 쿼리 한 번으로 확인"""
+    return select(Product.id, Product.quantity).where(Product.id.in_(product_ids))
+
+
+def upsert_cart_stmt(user_id: int) -> Insert:
+    stmt = insert(Cart).values(user_id=user_id)
+    return stmt.on_conflict_do_update(index_elements=[Cart.user_id],
+                                      set_={"revision": Cart.revision + 1, "updated_at": func.now()})
+
+
+def upsert_cart_item_stmt(cart_id: int, product_id: int, quantity: int) -> Insert:
+    in_stock_product = (
+        select(literal(cart_id), Product.id, literal(quantity))
+        .where(Product.id == product_id, Product.quantity >= quantity)
+    )
+    stmt = insert(CartItem).from_select(["cart_id", "product_id", "quantity"], in_stock_product)
+    return stmt.on_conflict_do_update(index_elements=[CartItem.cart_id, CartItem.product_id],
+                                      set_={"quantity": CartItem.quantity + stmt.excluded.quantity})
+
+
+def upsert_cart_items_stmt(cart_id: int, quantities: dict[int, int]) -> Insert:
+    stmt = insert(CartItem).values([
+        {"cart_id": cart_id, "product_id": product_id, "quantity": quantity}
+        for product_id, quantity in quantities.items()
+    ])
+    return stmt.on_conflict_do_update(index_elements=[CartItem.cart_id, CartItem.product_id],
+                                      set_={"quantity": CartItem.quantity + stmt.excluded.quantity})
+
+
+async def upsert_cart(session: AsyncSession, user_id: int) -> int:
+    """
+    유저의 장바구니 id 반환, 없으면 생성 (쿼리 1회)
+    장바구니를 변경하기 전에 호출되므로 이미 있는 장바구니는 revision 증가
+    """
+    return await session.scalar(upsert_cart_stmt(user_id).returning(Cart.id))
+
+
+async def upsert_cart_item(session: AsyncSession,
+                           cart_id: int,
+                           product_id: int,
+                           quantity: int) -> CartItem | None:
+    """
+    재고가 충분한 경우에만 장바구니 아이템을 추가, 이미 담긴 상품이면 수량만 증가 (쿼리 1회)
+    상품이 없거나 재고가 부족하면 None 반환
+    """
+    stmt = upsert_cart_item_stmt(cart_id, product_id, quantity)
+    return await session.scalar(stmt.returning(CartItem),
+                                execution_options={"populate_existing": True})
+
+
+async def upsert_cart_items(session: AsyncSession, cart_id: int, quantities: dict[int, int]):
+    """여러 상품을 multi-row INSERT 한 번으로 추가, 이미 담긴 상품은 수량만 증가 (재고 검증은 호출 측 책임)"""
+    await session.execute(upsert_cart_items_stmt(cart_id, quantities))
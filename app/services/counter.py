@@ -0,0 +1,41 @@
+import asyncio
+import logging
+
+from sqlalchemy import select, func, update, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models.entity_count import EntityCount, COUNTED_TABLES
+
+
+async def get_count(session: AsyncSession, table_name: str) -> int:
+    """카운터 테이블에서 row 수 조회 (PK 조회 1회), 카운터가 없으면 COUNT(*)로 대체"""
+    count = await session.scalar(select(EntityCount.count).where(EntityCount.name == table_name))
+    if count is None:
+        logging.warning(f"counter of {table_name} is not initialized, fallback to COUNT(*)")
+        count = await session.scalar(select(func.count()).select_from(table(table_name)))
+
+    return count
+
+
+async def reconcile_counts(session: AsyncSession):
+    """트리거 누락, 수동 수정 등으로 어긋난 카운터를 실제 row 수로 보정"""
+    for table_name in COUNTED_TABLES:
+        actual_count = select(func.count()).select_from(table(table_name)).scalar_subquery()
+        stmt = (
+            update(EntityCount)
+            .where(EntityCount.name == table_name)
+            .values(count=actual_count)
+        )
+        await session.execute(stmt)
+
+
+async def run_count_reconciler(interval_seconds: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                await reconcile_counts(session)
+                await session.commit()
+        except Exception:
+            logging.exception("failed to reconcile counts")
@@ -0,0 +1,51 @@
+import csv
+import io
+from typing import AsyncIterator, Callable, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import Select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.file_format import FileFormat
+
+MEDIA_TYPES = {
+    FileFormat.NDJSON: "application/x-ndjson",
+    FileFormat.CSV: "text/csv",
+}
+
+
+async def stream_models(session: AsyncSession,
+                        stmt: Select,
+                        to_model: Callable[[Row], BaseModel],
+                        batch_size: int) -> AsyncIterator[list[BaseModel]]:
+    """
+    server-side cursor로 batch_size 개씩 조회해서 응답 모델 목록으로 변환
+    전체 결과를 메모리에 올리지 않으므로 테이블 크기와 무관하게 메모리 사용량 일정
+    """
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        yield [to_model(row) for row in partition]
+
+
+async def encode_export(partitions: AsyncIterator[list[BaseModel]],
+                        file_format: FileFormat,
+                        csv_fields: Sequence[str],
+                        to_csv_rows: Callable[[BaseModel], list[dict]] = lambda model: [model.model_dump()]
+                        ) -> AsyncIterator[bytes]:
+    """batch 단위로 NDJSON 또는 CSV로 인코딩, batch마다 한 번씩 응답으로 전송"""
+    if file_format == FileFormat.NDJSON:
+        async for models in partitions:
+            yield b"".join(model.model_dump_json().encode() + b"\n" for model in models)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_fields, extrasaction="ignore")
+    writer.writeheader()
+    async for models in partitions:
+        for model in models:
+            writer.writerows(to_csv_rows(model))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,41 @@
+from sqlalchemy import select, func, Select
+from sqlalchemy.orm import selectinload
+
+from app.models import Cart, CartItem, Order
+
+
+def user_cart_query(user_id: int) -> Select:
+    """주문할 장바구니와 아이템, 상품 정보는 재고 차감 시 함께 조회하므로 로딩하지 않음"""
+    return (
+        select(Cart)
+        .where(Cart.user_id == user_id)
+        .options(selectinload(Cart.items).noload(CartItem.product))
+    )
+
+
+def order_count_query(user_id: int) -> Select:
+    return select(func.count()).select_from(Order).where(Order.user_id == user_id)
+
+
+def orders_page_query(user_id: int, page: int, size: int) -> Select:
+    """
+    최근 주문 순 페이지, 주문 -> 주문 아이템을 페이지 크기와 무관하게 쿼리 2번으로 로딩 (lazy load 방지)
+    상품 이름은 주문 아이템에 스냅샷으로 저장되어 있어 products join 불필요
+    """
+    return (
+        select(Order)
+        .where(Order.user_id == user_id)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+        .options(selectinload(Order.items))
+    )
+
+
+def orders_export_query(user_id: int) -> Select:
+    return (
+        select(Order)
+        .where(Order.user_id == user_id)
+        .order_by(Order.created_at, Order.id)
+        .options(selectinload(Order.items))
+    )
@@ -0,0 +1,100 @@
+import time
+import uuid
+
+from app.core.cache import TTLCache
+from app.core.cache_backend import CacheBackend, cache_backend
+from app.core.config import PRODUCT_CACHE_SIZE, PRODUCT_CACHE_TTL_SECONDS
+
+VERSION_KEY = "products:version"
+EPOCH_KEY = "products:epoch"
+INVALIDATE_CHANNEL = "products:invalidate"
+
+
+class ProductCache:
+    """
+    상품 목록 페이지, 단일 상품 응답 캐시, 직렬화된 JSON bytes를 그대로 저장
+    프로세스 로컬 LRU(L1) + 공유 캐시 백엔드(L2), 키에 카탈로그 version을 포함
+    카탈로그가 변경되면(상품 추가, 재고 변경) 공유 version을 올리고 pub/sub으로 다른 worker의 L1도 무효화
+    pub/sub 메시지가 유실되어도 로컬 version은 최대 TTL 동안만 사용하고 공유 version을 다시 읽음
+    """
+
+    def __init__(self, backend: CacheBackend, max_size: int, ttl_seconds: int):
+        self.version = 0
+        self._version_checked_at = float("-inf")
+        # 캐시 백엔드가 재시작되어 version이 0부터 다시 시작해도 이전 ETag와 겹치지 않도록 구분
+        self.epoch = uuid.uuid4().hex[:8]
+        self.ttl_seconds = ttl_seconds
+        self._backend = backend
+        self._local: TTLCache[str, bytes] = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds, size_of=len)
+
+    async def start(self):
+        """lifespan에서 호출, 현재 공유 version, epoch을 읽고 무효화 채널 구독"""
+        # 여러 worker가 동시에 시작해도 먼저 저장한 epoch 하나만 사용
+        await self._backend.set_if_absent(EPOCH_KEY, self.epoch.encode())
+        epoch = await self._backend.get(EPOCH_KEY)
+        self.epoch = epoch.decode()
+
+        await self._refresh_version()
+        await self._backend.subscribe(INVALIDATE_CHANNEL, self._on_invalidate)
+
+    def _on_invalidate(self, message: str):
+        version = int(message)
+        if version > self.version:
+            self.version = version
+            self._local.clear()
+
+    async def _refresh_version(self):
+        version = await self._backend.get(VERSION_KEY)
+        version = int(version) if version else 0
+        # 공유 version이 기준, 캐시 백엔드가 초기화되어 작아진 경우도 반영
+        if version != self.version:
+            self.version = version
+            self._local.clear()
+        self._version_checked_at = time.monotonic()
+
+    def _etag(self) -> str:
+        # 같은 version이라도 TTL 구간이 바뀌면 ETag가 바뀌어, 무효화가 전달되지 않는 worker도 304를 TTL 이상 응답하지 않음
+        window = int(time.time() // self.ttl_seconds) if self.ttl_seconds > 0 else 0
+        return f'"{self.epoch}.{self.version}.{window}"'
+
+    async def current(self) -> tuple[int, str]:
+        """조회 시작 시점의 (version, ETag), 로컬 version은 TTL이 지나면 공유 version을 다시 읽음"""
+        if time.monotonic() - self._version_checked_at >= self.ttl_seconds:
+            await self._refresh_version()
+        return self.version, self._etag()
+
+    def _shared_key(self, key: str, version: int) -> str:
+        return f"products:{version}:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        value = self._local.get(key)
+        if value is not None or not self._backend.shared:
+            return value
+
+        value = await self._backend.get(self._shared_key(key, self.version))
+        if value is not None:
+            self._local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: bytes, version: int):
+        """조회 시작 시점의 version을 받아, 조회 중 무효화되었다면 오래된 값을 저장하지 않음"""
+        if version != self.version:
+            return
+
+        self._local.set(key, value)
+        # 프로세스 로컬 백엔드는 L1과 같은 프로세스 메모리이므로 L1에만 저장
+        if self._backend.shared:
+            await self._backend.set(self._shared_key(key, version), value, self.ttl_seconds)
+
+    async def invalidate(self):
+        # 이전 version의 공유 키는 TTL로 만료됨
+        version = await self._backend.incr(VERSION_KEY)
+        self._on_invalidate(str(version))
+        self._version_checked_at = time.monotonic()
+        await self._backend.publish(INVALIDATE_CHANNEL, str(version))
+
+    def stats(self) -> dict:
+        return {"version": self.version, "backend": type(self._backend).__name__, **self._local.stats()}
+
+
+product_cache = ProductCache(cache_backend, max_size=PRODUCT_CACHE_SIZE, ttl_seconds=PRODUCT_CACHE_TTL_SECONDS)
@@ -0,0 +1,188 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy import select, exists, Select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.file_format import FileFormat
+from app.models import Product
+from app.schemas.product import ProductCreate
+from app.utils.normalize_name import normalize_name
+
+# 줄바꿈 없이 계속 들어오는 입력으로 메모리가 늘어나지 않도록 한 줄 최대 길이 제한
+MAX_LINE_LENGTH = 64 * 1024
+CSV_FIELDS = ("name", "description", "price", "quantity")
+CSV_INT_FIELDS = ("price", "quantity")
+
+ParsedRow = tuple[int, dict | str]
+
+
+class ImportFormatError(Exception):
+    def __init__(self, message: str, line_no: int | None = None):
+        super().__init__(message)
+        self.line_no = line_no
+
+
+def product_name_exists_query(normalized_name: str) -> Select:
+    """정규화된 상품명 중복 확인, normalized_name unique 인덱스 사용"""
+    return select(exists().where(Product.normalized_name == normalized_name))
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """byte chunk 스트림을 줄 단위로 변환, 전체 파일을 메모리에 올리지 않음"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(buffer) > MAX_LINE_LENGTH:
+            raise ImportFormatError(f"line is longer than {MAX_LINE_LENGTH} characters")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def _numbered_lines(lines: AsyncIterable[str]) -> AsyncIterator[tuple[int, str]]:
+    line_no = 0
+    try:
+        async for line in lines:
+            line_no += 1
+            yield line_no, line
+    except ImportFormatError as e:
+        # 줄을 끝까지 읽지 못한 경우 다음 줄에서 실패
+        e.line_no = line_no + 1
+        raise
+
+
+async def parse_rows(lines: AsyncIterable[str], file_format: FileFormat) -> AsyncIterator[ParsedRow]:
+    """
+    (줄 번호, 상품 값 dict 또는 에러 메시지) 반환, 빈 줄은 무시
+    csv: 첫 줄은 header, 따옴표 안의 줄바꿈은 지원하지 않음
+    """
+    header: list[str] | None = None
+    async for line_no, line in _numbered_lines(lines):
+        if not line.strip():
+            continue
+
+        if file_format == FileFormat.NDJSON:
+            try:
+                values = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"invalid json: {e}"
+                continue
+            yield line_no, values if isinstance(values, dict) else "json object is required"
+            continue
+
+        fields = next(csv.reader([line]))
+        if header is None:
+            header = [field.strip() for field in fields]
+            missing = [field for field in CSV_FIELDS if field not in header]
+            if missing:
+                raise ImportFormatError(f"csv header is missing {missing}", line_no)
+            continue
+
+        if len(fields) != len(header):
+            yield line_no, f"expected {len(header)} columns, got {len(fields)}"
+            continue
+        values = dict(zip(header, fields))
+        # 상품 스키마는 strict 검증이므로 숫자 컬럼은 미리 변환, 변환 실패한 값은 검증 단계에서 에러로 보고
+        for field in CSV_INT_FIELDS:
+            try:
+                values[field] = int(values[field])
+            except ValueError:
+                pass
+        yield line_no, values
+
+
+def _report(line_no: int, status: str, detail: str) -> dict:
+    return {"line": line_no, "status": status, "detail": detail}
+
+
+async def _insert_batch(session: AsyncSession, batch: list[tuple[int, ProductCreate]]) -> tuple[int, list[dict]]:
+    """
+    상품 batch를 executemany 한 번으로 insert 후 commit, (생성 수, 중복 상품 report) 반환
+    이미 있는 상품명은 normalized_name unique 인덱스 ON CONFLICT DO NOTHING으로 건너뜀
+    """
+    reports = []
+    lines: dict[str, int] = {}
+    params = []
+    for line_no, product in batch:
+        normalized_name = normalize_name(product.name)
+        if normalized_name in lines:
+            reports.append(_report(line_no, "duplicate", f"same name as line {lines[normalized_name]}"))
+            continue
+
+        lines[normalized_name] = line_no
+        params.append({"name": normalized_name,
+                       "normalized_name": normalized_name,
+                       "description": product.description,
+                       "price": product.price,
+                       "quantity": product.quantity})
+
+    stmt = (
+        insert(Product)
+        .on_conflict_do_nothing(index_elements=[Product.normalized_name])
+        .returning(Product.normalized_name)
+    )
+    created = set((await session.scalars(stmt, params)).all())
+    await session.commit()
+
+    reports += [_report(line_no, "duplicate", "already exist product name")
+                for normalized_name, line_no in lines.items() if normalized_name not in created]
+    reports.sort(key=lambda report: report["line"])
+    return len(created), reports
+
+
+async def import_products(session: AsyncSession, rows: AsyncIterable[ParsedRow], batch_size: int) -> AsyncIterator[dict]:
+    """
+    상품을 batch_size 단위 트랜잭션으로 insert 하면서 실패, 중복 row의 report를 바로 반환
+    마지막에 {"status": "summary", ...} 반환
+    """
+    summary = {"status": "summary", "created": 0, "duplicate": 0, "error": 0}
+    batch: list[tuple[int, ProductCreate]] = []
+
+    async def flush():
+        created, reports = await _insert_batch(session, batch)
+        summary["created"] += created
+        summary["duplicate"] += len(reports)
+        batch.clear()
+        return reports
+
+    try:
+        async for line_no, values in rows:
+            if isinstance(values, str):
+                summary["error"] += 1
+                yield _report(line_no, "error", values)
+                continue
+
+            try:
+                batch.append((line_no, ProductCreate.model_validate(values)))
+            except ValidationError as e:
+                summary["error"] += 1
+                yield _report(line_no, "error", "; ".join(
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors()))
+                continue
+
+            if len(batch) >= batch_size:
+                for report in await flush():
+                    yield report
+
+        if batch:
+            for report in await flush():
+                yield report
+    except ImportFormatError as e:
+        # 형식 오류 이후는 처리할 수 없음, 오류 전까지 검증된 batch는 insert
+        if batch:
+            for report in await flush():
+                yield report
+        summary["error"] += 1
+        yield _report(e.line_no, "error", str(e))
+
+    yield summary
@@ -0,0 +1,60 @@
+from sqlalchemy import Select, tuple_
+
+from app.constants.product_sort import ProductSort
+from app.models import Product
+
+# 정렬별 (정렬 컬럼, 내림차순 여부), 정렬 컬럼이 같으면 id로 순서 확정
+# 각 정렬은 (컬럼, id) 인덱스 또는 PK를 그대로 따라가므로 임시 정렬이 필요 없음
+SORT_KEYS = {
+    ProductSort.ID: (None, False),
+    ProductSort.NEWEST: (None, True),
+    ProductSort.PRICE_ASC: (Product.price, False),
+    ProductSort.PRICE_DESC: (Product.price, True),
+    ProductSort.NAME: (Product.name, False),
+}
+
+
+def apply_filters(stmt: Select,
+                  min_price: int | None = None,
+                  max_price: int | None = None,
+                  in_stock: bool = False) -> Select:
+    if min_price is not None:
+        stmt = stmt.where(Product.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Product.price <= max_price)
+    if in_stock:
+        stmt = stmt.where(Product.quantity > 0)
+    return stmt
+
+
+def apply_sort(stmt: Select, sort: ProductSort) -> Select:
+    column, descending = SORT_KEYS[sort]
+    keys = [Product.id] if column is None else [column, Product.id]
+    return stmt.order_by(*[key.desc() if descending else key for key in keys])
+
+
+def apply_keyset(stmt: Select, sort: ProductSort, after: dict) -> Select:
+    """이전 페이지 마지막 상품 다음부터 조회, cursor 형식이 정렬과 맞지 않으면 ValueError"""
+    column, descending = SORT_KEYS[sort]
+    last_id = after.get("id")
+    if not isinstance(last_id, int) or after.get("sort", ProductSort.ID.value) != sort.value:
+        raise ValueError("invalid cursor")
+
+    if column is None:
+        return stmt.where(Product.id < last_id if descending else Product.id > last_id)
+
+    last_value = after.get("value")
+    if not isinstance(last_value, int if column is Product.price else str):
+        raise ValueError("invalid cursor")
+
+    # row value 비교, (정렬 컬럼, id) 인덱스 범위 탐색으로 처리됨
+    keys, last_keys = tuple_(column, Product.id), tuple_(last_value, last_id)
+    return stmt.where(keys < last_keys if descending else keys > last_keys)
+
+
+def cursor_values(product: Product, sort: ProductSort) -> dict:
+    column, _ = SORT_KEYS[sort]
+    if column is None:
+        # 기본 정렬은 기존 cursor 형식 유지
+        return {"id": product.id} if sort == ProductSort.ID else {"sort": sort.value, "id": product.id}
+    return {"sort": sort.value, "value": getattr(product, column.key), "id": product.id}
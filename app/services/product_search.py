@@ -0,0 +1,55 @@
+import re
+
+from sqlalchemy import select, func, literal_column, table, column, or_, and_, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Product
+from app.models.product import SEARCH_TABLE
+
+# 검색어 토큰 수 제한, 토큰마다 인덱스 조회가 추가됨
+MAX_SEARCH_TERMS = 10
+# bm25 컬럼 가중치 (name, description), 이름에 일치하는 상품을 우선
+NAME_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 1.0
+
+search_table = table(SEARCH_TABLE, column("rowid"))
+
+
+def build_match_query(q: str) -> str | None:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 변환, 각 단어를 prefix 검색하고 모두 포함(AND)해야 일치
+    FTS5 문법 문자는 큰따옴표로 감싸서 그대로 검색되도록 함, 검색할 단어가 없으면 None
+    """
+    terms = re.findall(r"\w+", q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_query(match_query: str, size: int, after: tuple[float, int] | None = None) -> Select:
+    rank = func.bm25(literal_column(SEARCH_TABLE), NAME_WEIGHT, DESCRIPTION_WEIGHT)
+    matches = (
+        select(search_table.c.rowid.label("id"), rank.label("rank"))
+        .where(literal_column(SEARCH_TABLE).op("MATCH")(match_query))
+    )
+    if after is not None:
+        last_rank, last_id = after
+        matches = matches.where(or_(rank > last_rank, and_(rank == last_rank, search_table.c.rowid > last_id)))
+    matches = matches.order_by(rank, search_table.c.rowid).limit(size).subquery()
+
+    return (
+        select(Product, matches.c.rank)
+        .join(matches, matches.c.id == Product.id)
+        .order_by(matches.c.rank, matches.c.id)
+    )
+
+
+async def search_products(session: AsyncSession,
+                          match_query: str,
+                          size: int,
+                          after: tuple[float, int] | None = None) -> list[tuple[Product, float]]:
+    """
+    관련도(bm25, 낮을수록 관련도 높음) 순으로 (상품, rank) 목록 반환
+    after: 이전 페이지 마지막 (rank, id), 이후 결과부터 조회
+    """
+    stmt = search_query(match_query, size, after)
+    return list((await session.execute(stmt)).tuples().all())
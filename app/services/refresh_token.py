@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timezone, timedelta
+from enum import Enum
+
+from sqlalchemy import delete, select, update, Delete, Select, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache_backend import cache_backend
+from app.core.config import REFRESH_TOKEN_REUSE_GRACE_SECONDS
+from app.core.security import refresh_token_expires_at
+from app.models import RefreshToken
+
+
+class Rotation(Enum):
+    ROTATED = "rotated"
+    # 교체 직후 같은 토큰으로 들어온 동시 요청 (grace 시간 이내)
+    RACED = "raced"
+    # 이미 교체된 토큰의 재사용, family 전체 폐기
+    REUSED = "reused"
+
+
+def evict_old_sessions_stmt(user_id: int, max_sessions: int) -> Delete:
+    """유저의 최근 max_sessions 개 세션만 남기고 삭제, (user_id, created_at) 인덱스 사용"""
+    recent = (
+        select(RefreshToken.id)
+        .where(RefreshToken.user_id == user_id)
+        .order_by(RefreshToken.created_at.desc(), RefreshToken.id.desc())
+        .limit(max_sessions)
+    )
+    return delete(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.id.not_in(recent))
+
+
+def rotate_token_stmt(token_hash: str, new_token_hash: str, now: datetime) -> Update:
+    """현재 토큰 hash로 찾아서 교체하는 인덱스 UPDATE 한 번"""
+    return (
+        update(RefreshToken)
+        .where(RefreshToken.token_hash == token_hash)
+        .values(token_hash=new_token_hash, previous_token_hash=token_hash, rotated_at=now,
+                expires_at=refresh_token_expires_at())
+    )
+
+
+def raced_token_query(token_hash: str, now: datetime) -> Select:
+    """grace 시간 안에 token_hash에서 교체된 세션"""
+    return select(RefreshToken.id).where(
+        RefreshToken.previous_token_hash == token_hash,
+        RefreshToken.rotated_at >= now - timedelta(seconds=REFRESH_TOKEN_REUSE_GRACE_SECONDS))
+
+
+def revoke_family_stmt(family_id: str) -> Delete:
+    return delete(RefreshToken).where(RefreshToken.family_id == family_id)
+
+
+async def evict_old_sessions(session: AsyncSession, user_id: int, max_sessions: int) -> int:
+    result = await session.execute(evict_old_sessions_stmt(user_id, max_sessions))
+    return result.rowcount
+
+
+async def rotate_refresh_token(session: AsyncSession, token_hash: str, new_token_hash: str, family_id: str) -> Rotation:
+    """현재 토큰을 교체, 없으면 직전 토큰인지 확인"""
+    now = datetime.now(tz=timezone.utc)
+    if await session.scalar(rotate_token_stmt(token_hash, new_token_hash, now).returning(RefreshToken.id)) is not None:
+        return Rotation.ROTATED
+
+    if await session.scalar(raced_token_query(token_hash, now)) is not None:
+        return Rotation.RACED
+
+    # 서명은 유효하지만 이미 교체된 토큰 -> 탈취된 토큰의 재사용으로 보고 family 전체 폐기
+    await session.execute(revoke_family_stmt(family_id))
+    return Rotation.REUSED
+
+
+def _rotated_tokens_key(token_hash: str) -> str:
+    return f"refresh_token:rotated:{token_hash}"
+
+
+async def save_rotated_tokens(token_hash: str, access_token: str, refresh_token: str):
+    """이전 토큰 hash -> 교체로 발급한 (access, refresh) 토큰, grace 시간 동안만 공유 캐시에 보관"""
+    if REFRESH_TOKEN_REUSE_GRACE_SECONDS <= 0:
+        return
+    await cache_backend.set(_rotated_tokens_key(token_hash),
+                            json.dumps([access_token, refresh_token]).encode(),
+                            REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+
+
+async def get_rotated_tokens(token_hash: str) -> tuple[str, str] | None:
+    cached = await cache_backend.get(_rotated_tokens_key(token_hash))
+    if cached is None:
+        return None
+    access_token, refresh_token = json.loads(cached)
+    return access_token, refresh_token
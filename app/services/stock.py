@@ -0,0 +1,54 @@
+from sqlalchemy import select, update, case, func, Row, Update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Product
+
+
+class InsufficientStockError(Exception):
+    def __init__(self, product_ids: list[int]):
+        super().__init__(f"insufficient quantity: {product_ids}")
+        self.product_ids = product_ids
+
+
+def reserve_stock_stmt(quantities: dict[int, int]) -> Update:
+    stock = aliased(Product)
+    satisfiable_count = (
+        select(func.count())
+        .select_from(stock)
+        .where(stock.id.in_(quantities.keys()),
+               stock.quantity >= case(quantities, value=stock.id))
+        .scalar_subquery()
+    )
+
+    requested = case(quantities, value=Product.id)
+    return (
+        update(Product)
+        .where(Product.id.in_(quantities.keys()),
+               Product.quantity >= requested,
+               # 모든 상품의 재고가 충분할 때만 차감 (all or nothing)
+               satisfiable_count == len(quantities))
+        .values(quantity=Product.quantity - requested)
+    )
+
+
+async def reserve_stock(session: AsyncSession, quantities: dict[int, int]) -> dict[int, Row]:
+    """
+    {product_id: 수량} 만큼 재고를 조건부 UPDATE 한 번으로 차감
+    하나라도 재고가 부족하면 어떤 상품도 차감하지 않고 InsufficientStockError 발생
+    반환값: {product_id: (id, price, name)}
+    """
+    stmt = (
+        reserve_stock_stmt(quantities)
+        .returning(Product.id, Product.price, Product.name)
+        .execution_options(synchronize_session="fetch")
+    )
+    reserved = {row.id: row for row in (await session.execute(stmt)).all()}
+
+    if len(reserved) != len(quantities):
+        stmt = select(Product.id).where(Product.id.in_(quantities.keys()),
+                                        Product.quantity >= case(quantities, value=Product.id))
+        satisfiable = set((await session.scalars(stmt)).all())
+        raise InsufficientStockError(sorted(set(quantities) - satisfiable))
+
+    return reserved
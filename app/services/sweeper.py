@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import select, delete, Delete, Select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import SWEEP_BATCH_SIZE, CART_IDLE_DAYS
+from app.db.session import AsyncSessionLocal
+from app.models import RefreshToken, Cart, CartItem
+
+
+def expired_refresh_tokens_stmt(now: datetime, limit: int) -> Delete:
+    """만료된 refresh token 최대 limit 개 삭제, expires_at 인덱스 사용"""
+    expired = select(RefreshToken.id).where(RefreshToken.expires_at < now).limit(limit)
+    return delete(RefreshToken).where(RefreshToken.id.in_(expired))
+
+
+def idle_carts_query(idle_before: datetime, limit: int) -> Select:
+    return select(Cart.id).where(Cart.updated_at < idle_before).limit(limit)
+
+
+def cart_items_by_carts_stmt(cart_ids: list[int]) -> Delete:
+    return delete(CartItem).where(CartItem.cart_id.in_(cart_ids))
+
+
+async def delete_expired_refresh_tokens(session: AsyncSession, now: datetime, limit: int) -> int:
+    result = await session.execute(expired_refresh_tokens_stmt(now, limit))
+    return result.rowcount
+
+
+async def delete_idle_carts(session: AsyncSession, idle_before: datetime, limit: int) -> tuple[int, int]:
+    """idle_before 이후 변경이 없는 장바구니와 아이템 삭제, (장바구니 수, 아이템 수) 반환"""
+    cart_ids = (await session.scalars(idle_carts_query(idle_before, limit))).all()
+    if not cart_ids:
+        return 0, 0
+
+    items = await session.execute(cart_items_by_carts_stmt(cart_ids))
+    carts = await session.execute(delete(Cart).where(Cart.id.in_(cart_ids)))
+    return carts.rowcount, items.rowcount
+
+
+class Sweeper:
+    """
+    만료된 refresh token, 오래 사용하지 않은 장바구니를 주기적으로 삭제
+    batch_size 단위로 트랜잭션을 나눠서 sqlite 쓰기 lock을 짧게 유지
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, batch_size: int, cart_idle_days: int):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.cart_idle_days = cart_idle_days
+        self.runs = 0
+        self.last_run_at: datetime | None = None
+        self.reclaimed = {"refresh_tokens": 0, "carts": 0, "cart_items": 0}
+
+    async def _delete_in_batches(self, delete_batch) -> int:
+        total = 0
+        while True:
+            async with self._session_factory() as session:
+                deleted = await delete_batch(session)
+                await session.commit()
+            total += deleted
+            if deleted < self.batch_size:
+                return total
+            # 다른 쓰기 요청이 lock을 얻을 수 있도록 양보
+            await asyncio.sleep(0)
+
+    async def sweep(self) -> dict:
+        now = datetime.now(tz=timezone.utc)
+        idle_before = now - timedelta(days=self.cart_idle_days)
+        reclaimed = {"refresh_tokens": 0, "carts": 0, "cart_items": 0}
+
+        reclaimed["refresh_tokens"] = await self._delete_in_batches(
+            lambda session: delete_expired_refresh_tokens(session, now, self.batch_size))
+
+        async def delete_carts_batch(session: AsyncSession) -> int:
+            carts, items = await delete_idle_carts(session, idle_before, self.batch_size)
+            reclaimed["cart_items"] += items
+            return carts
+
+        reclaimed["carts"] = await self._delete_in_batches(delete_carts_batch)
+
+        self.runs += 1
+        self.last_run_at = now
+        for name, count in reclaimed.items():
+            self.reclaimed[name] += count
+        return reclaimed
+
+    async def run(self, interval_seconds: int):
+        while True:
+            try:
+                reclaimed = await self.sweep()
+                if any(reclaimed.values()):
+                    logging.info(f"sweeper reclaimed {reclaimed}")
+            except Exception:
+                logging.exception("failed to sweep expired rows")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "reclaimed": dict(self.reclaimed),
+        }
+
+
+sweeper = Sweeper(AsyncSessionLocal, batch_size=SWEEP_BATCH_SIZE, cart_idle_days=CART_IDLE_DAYS)
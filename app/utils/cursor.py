@@ -0,0 +1,21 @@
+import base64
+import json
+
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """cursor 문자열을 dict로 복원, 형식이 잘못된 경우 ValueError"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (ValueError, TypeError) as e:
+        raise ValueError("invalid cursor") from e
+
+    if not isinstance(values, dict):
+        raise ValueError("invalid cursor")
+
+    return values
@@ -0,0 +1,48 @@
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette import status
+from starlette.requests import ClientDisconnect
+from starlette.types import Scope, Receive, Send
+
+
+def json_response(content: BaseModel | bytes, status_code: int = 200, etag: str | None = None) -> Response:
+    """
+    pydantic-core 직렬화 결과(bytes)를 그대로 응답
+    response_model 재검증, jsonable_encoder, json.dumps 단계를 거치지 않음
+    """
+    if isinstance(content, BaseModel):
+        content = content.model_dump_json().encode()
+    headers = {"ETag": etag} if etag else None
+    return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더 비교 (weak 비교, 여러 값, * 허용)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    요청 body를 읽으면서 동시에 응답을 보내는 StreamingResponse
+    기본 구현은 disconnect 감지를 위해 receive를 호출하므로 아직 읽지 않은 요청 body를 가로챔
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
@@ -1,12 +1,14 @@
-import time
+import asyncio
+from datetime import datetime, timezone, timedelta
 
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.v1.endpoints.users import password_hash
-from app.core.security import create_refresh_token
+from app.core.password import password_hash
+from app.core.security import create_refresh_token, hash_token, verify_access_token, refresh_token_expires_at
 from app.models import User, RefreshToken
+from app.schemas.user import UserData
 
 
 async def test_signin_success(async_client: AsyncClient, async_session: AsyncSession):
@@ -28,31 +30,36 @@ async def test_signin_success(async_client: AsyncClient, async_session: AsyncSes
     assert response.cookies["access_token"] is not None
     assert response.cookies["refresh_token"] is not None
 
-    # refresh token db 저장 검증
+    # refresh token db 저장 검증, 원문 대신 hash 저장
 
     result = await async_session.execute(select(RefreshToken).where(RefreshToken.user_id == test_user.id))
     result = result.scalar_one_or_none()
 
     assert result is not None
-    assert result.token == response.cookies["refresh_token"]
+    assert result.token_hash == hash_token(response.cookies["refresh_token"])
 
 
-async def test_refresh_token_success(async_client: AsyncClient, async_session: AsyncSession):
-    # 테스트 유저, 토큰 저장
+async def create_test_token(async_session: AsyncSession) -> tuple[RefreshToken, str]:
     test_user = User(email="test@example.com",
                      hashed_password=password_hash.hash("12345678"),
                      is_active=True)
     async_session.add(test_user)
     await async_session.flush()
 
-    old_token = create_refresh_token(test_user.id)
-    test_token = RefreshToken(user=test_user, token=old_token)
+    old_token = create_refresh_token(UserData.model_validate(test_user), "family")
+    test_token = RefreshToken(user=test_user, token_hash=hash_token(old_token), family_id="family",
+                              expires_at=refresh_token_expires_at())
 
     async_session.add(test_token)
     await async_session.commit()
     await async_session.refresh(test_token)
 
-    time.sleep(1)
+    return test_token, old_token
+
+
+async def test_refresh_token_success(async_client: AsyncClient, async_session: AsyncSession):
+    # 테스트 유저, 토큰 저장
+    test_token, old_token = await create_test_token(async_session)
 
     async_client.cookies = {"refresh_token": old_token}
     response = await async_client.post("/auth/refresh_token")
@@ -61,6 +68,77 @@ async def test_refresh_token_success(async_client: AsyncClient, async_session: A
     assert response.cookies["access_token"] is not None
     assert response.cookies["refresh_token"] is not None
     assert response.cookies["refresh_token"] != old_token
+    assert verify_access_token(response.cookies["access_token"]).user.email == "test@example.com"
 
     await async_session.refresh(test_token)
-    assert test_token.token == response.cookies["refresh_token"]
+    assert test_token.token_hash == hash_token(response.cookies["refresh_token"])
+    assert test_token.family_id == "family"
+
+
+async def test_refresh_token_reuse_revoke_family(async_client: AsyncClient, async_session: AsyncSession):
+    """grace 시간 이후 이미 교체된 토큰을 다시 사용하면 family 전체가 폐기되어 새 토큰도 사용 불가"""
+    test_token, old_token = await create_test_token(async_session)
+
+    async_client.cookies = {"refresh_token": old_token}
+    rotated = await async_client.post("/auth/refresh_token")
+    new_token = rotated.cookies["refresh_token"]
+
+    await async_session.execute(update(RefreshToken)
+                                .where(RefreshToken.id == test_token.id)
+                                .values(rotated_at=datetime.now(tz=timezone.utc) - timedelta(minutes=1)))
+    async_client.cookies = {"refresh_token": old_token}
+    reused = await async_client.post("/auth/refresh_token")
+
+    async_client.cookies = {"refresh_token": new_token}
+    after_revoke = await async_client.post("/auth/refresh_token")
+
+    assert rotated.status_code == 201
+    assert reused.status_code == 401
+    assert after_revoke.status_code == 401
+    assert await async_session.scalar(select(RefreshToken).where(RefreshToken.family_id == "family")) is None
+
+
+async def test_refresh_token_concurrent(file_client: AsyncClient, file_session_factory):
+    """같은 쿠키로 동시에 refresh 하면 family를 폐기하지 않고 모두 현재 토큰을 받음"""
+    async with file_session_factory() as session:
+        test_token, old_token = await create_test_token(session)
+
+    responses = await asyncio.gather(*[
+        file_client.post("/auth/refresh_token", headers={"Cookie": f"refresh_token={old_token}"})
+        for _ in range(3)
+    ])
+    tokens = {response.cookies["refresh_token"] for response in responses}
+
+    async with file_session_factory() as session:
+        stored = await session.scalar(select(RefreshToken).where(RefreshToken.family_id == "family"))
+
+    assert [response.status_code for response in responses] == [201, 201, 201]
+    assert len(tokens) == 1
+    assert stored.token_hash == hash_token(tokens.pop())
+
+
+async def test_signin_multiple_devices(async_client: AsyncClient, async_session: AsyncSession, monkeypatch):
+    """여러 기기에서 signin해도 기존 세션 유지, 최대 세션 수를 넘으면 가장 오래된 세션부터 만료"""
+    monkeypatch.setattr("app.api.v1.endpoints.auth.REFRESH_TOKEN_MAX_SESSIONS", 2)
+    test_user = User(email="test@example.com",
+                     hashed_password=password_hash.hash("12345678"),
+                     is_active=True)
+    async_session.add(test_user)
+    await async_session.commit()
+
+    tokens = []
+    for _ in range(3):
+        response = await async_client.post("/auth/signin", json={"email": test_user.email, "password": "12345678"})
+        tokens.append(response.cookies["refresh_token"])
+
+    stored = (await async_session.scalars(select(RefreshToken.token_hash)
+                                          .where(RefreshToken.user_id == test_user.id))).all()
+    assert sorted(stored) == sorted([hash_token(tokens[1]), hash_token(tokens[2])])
+
+    # 남아있는 세션은 각각 독립적으로 refresh 가능
+    for token in tokens[1:]:
+        async_client.cookies = {"refresh_token": token}
+        assert (await async_client.post("/auth/refresh_token")).status_code == 201
+
+    async_client.cookies = {"refresh_token": tokens[0]}
+    assert (await async_client.post("/auth/refresh_token")).status_code == 401
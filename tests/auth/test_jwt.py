@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 
 from app.constants.role import Role
 from app.core.config import TOKEN_ISSUER
+from app.core.get_current_user import get_current_user, token_cache
 from app.core.security import create_access_token, verify_access_token
 from app.schemas.user import UserData
 
@@ -19,3 +20,17 @@ def test_create_and_verify_access_token_success():
     assert payload.iss == TOKEN_ISSUER
     timediff = datetime.now(tz=timezone.utc) - payload.iat
     assert timediff.seconds < 3
+
+
+def test_get_current_user_cached():
+    user = UserData(id=1, email="user@example.com", role=Role.USER, is_active=True)
+    access_token = create_access_token(user)
+    token_cache.clear()
+    hits = token_cache.hits
+
+    first = get_current_user(access_token)
+    second = get_current_user(access_token)
+
+    assert first == user
+    assert second is first
+    assert token_cache.hits == hits + 1
@@ -3,8 +3,9 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy import StaticPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
-from app.db.session import get_session, Base
+from app.db.session import get_session, get_read_session, Base, create_engine
 from app.main import app
+from app.services.product_cache import product_cache
 
 TEST_DB_URL = "sqlite+aiosqlite:///:memory"
 BASE_URL = "http://test/api/v1"
@@ -50,6 +51,36 @@ async def async_client(async_session):
         yield async_session
 
     app.dependency_overrides[get_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
+    await product_cache.invalidate()
+
+    async with AsyncClient(transport=ASGITransport(app=app),
+                           base_url=BASE_URL) as client:
+        yield client
+
+    app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def file_session_factory(tmp_path):
+    """운영과 같은 파일 sqlite (쓰기 연결 1개), 요청마다 별도 세션이 필요한 동시성 테스트용"""
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="function")
+async def file_client(file_session_factory):
+    async def override_get_db():
+        async with file_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_db
+    app.dependency_overrides[get_read_session] = override_get_db
 
     async with AsyncClient(transport=ASGITransport(app=app),
                            base_url=BASE_URL) as client:
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.core.cache import TTLCache
+from app.core.cache_backend import MemoryCacheBackend, RedisCacheBackend
+from app.schemas.product import ProductData
+from app.services.product_cache import ProductCache, INVALIDATE_CHANNEL, EPOCH_KEY
+
+
+def test_ttl_cache_evict_least_recently_used():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_expire():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, expires_at=time.time() - 1)
+    cache.set("b", 2)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request):
+    if request.param == "memory":
+        backend = MemoryCacheBackend()
+    else:
+        backend = RedisCacheBackend(FakeRedis(server=FakeServer()))
+    yield backend
+    await backend.close()
+
+
+async def test_cache_backend_get_set_incr(backend):
+    assert await backend.get("a") is None
+
+    await backend.set("a", b"1", ttl_seconds=60)
+    assert await backend.get("a") == b"1"
+
+    await backend.delete("a")
+    assert await backend.get("a") is None
+
+    assert await backend.incr("version") == 1
+    assert await backend.incr("version") == 2
+    assert await backend.get("version") == b"2"
+
+    assert await backend.set_if_absent("epoch", b"a") is True
+    assert await backend.set_if_absent("epoch", b"b") is False
+    assert await backend.get("epoch") == b"a"
+
+
+async def test_product_cache_share_between_workers():
+    # 같은 Redis 서버를 공유하는 두 worker 프로세스
+    server = FakeServer()
+    backend_a = RedisCacheBackend(FakeRedis(server=server))
+    backend_b = RedisCacheBackend(FakeRedis(server=server))
+    cache_a = ProductCache(backend_a, max_size=10, ttl_seconds=60)
+    cache_b = ProductCache(backend_b, max_size=10, ttl_seconds=60)
+    await cache_a.start()
+    await cache_b.start()
+
+    body = ProductData(id=1, name="apple", description="", price=100, quantity=1).model_dump_json().encode()
+    await cache_a.set("product:1", body, cache_a.version)
+    assert await cache_b.get("product:1") == body
+
+    await cache_a.invalidate()
+    for _ in range(100):
+        if cache_b.version == cache_a.version:
+            break
+        await asyncio.sleep(0.01)
+
+    assert cache_b.version == cache_a.version
+    assert await cache_b.get("product:1") is None
+
+    await backend_a.close()
+    await backend_b.close()
+
+
+async def test_product_cache_share_epoch(backend):
+    cache_a = ProductCache(backend, max_size=10, ttl_seconds=60)
+    cache_b = ProductCache(backend, max_size=10, ttl_seconds=60)
+    await asyncio.gather(cache_a.start(), cache_b.start())
+
+    assert cache_a.epoch == cache_b.epoch == (await backend.get(EPOCH_KEY)).decode()
+
+
+async def test_product_cache_refresh_version_after_lost_invalidation():
+    backend = MemoryCacheBackend()
+    cache_a = ProductCache(backend, max_size=10, ttl_seconds=60)
+    cache_b = ProductCache(backend, max_size=10, ttl_seconds=60)
+    await cache_a.start()
+    await cache_b.start()
+    old_version, old_etag = await cache_b.current()
+    await cache_b.set("product:1", b"{}", old_version)
+
+    # 무효화 메시지 유실
+    backend._handlers[INVALIDATE_CHANNEL].clear()
+    await cache_a.invalidate()
+    assert await cache_b.current() == (old_version, old_etag)
+
+    # TTL이 지나면 공유 version을 다시 읽음
+    cache_b._version_checked_at -= 60
+    version, etag = await cache_b.current()
+    assert version == cache_a.version
+    assert etag != old_etag
+    assert await cache_b.get("product:1") is None
+
+
+async def test_product_cache_etag_expire_with_ttl(monkeypatch):
+    # 공유되지 않는 백엔드를 쓰는 worker도 TTL이 지나면 다른 ETag를 응답
+    cache = ProductCache(MemoryCacheBackend(), max_size=10, ttl_seconds=60)
+    await cache.start()
+    now = time.time()
+
+    monkeypatch.setattr(time, "time", lambda: now)
+    _, etag = await cache.current()
+    monkeypatch.setattr(time, "time", lambda: now + 60)
+    _, next_etag = await cache.current()
+
+    assert etag != next_etag
+
+
+async def test_product_cache_memory_backend_stores_l1_only():
+    # 프로세스 로컬 백엔드에는 페이지를 중복 저장하지 않음
+    backend = MemoryCacheBackend()
+    cache = ProductCache(backend, max_size=10, ttl_seconds=60)
+    await cache.start()
+
+    await cache.set("product:1", b"{}", cache.version)
+
+    assert await cache.get("product:1") == b"{}"
+    assert await backend.get(cache._shared_key("product:1", cache.version)) is None
+    assert cache.stats()["memory_bytes"] == 2
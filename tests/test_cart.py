@@ -1,7 +1,7 @@
 import logging
 import pytest_asyncio
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, event
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
@@ -89,9 +89,43 @@ async def test_add_cart_item_insufficient_quantity(setup, async_client: AsyncCli
     assert response.status_code == 400
 
 
+async def test_add_cart_item_twice(setup,
+                                   async_session: AsyncSession,
+                                   async_client: AsyncClient):
+    """같은 상품을 두 번 담으면 ON CONFLICT(cart_id, product_id)로 한 row에 수량 합산"""
+    products = setup["products"]
+
+    first = await async_client.post("/cart/item", json={"product_id": products[0].id, "quantity": 1})
+    second = await async_client.post("/cart/item", json={"product_id": products[0].id, "quantity": 2})
+
+    items = (await async_session.scalars(select(CartItem).execution_options(populate_existing=True))).all()
+
+    assert first.status_code == second.status_code == status.HTTP_201_CREATED
+    assert [(item.product_id, item.quantity) for item in items] == [(products[0].id, 3)]
+
+
+async def test_add_cart_item_rejected_without_write(setup,
+                                                    async_session: AsyncSession,
+                                                    async_client: AsyncClient):
+    """재고가 없는 상품, 존재하지 않는 상품은 400이고 장바구니 아이템이 생성되지 않음"""
+    products = setup["products"]
+
+    out_of_stock = await async_client.post("/cart/item", json={"product_id": products[2].id, "quantity": 1})
+    not_found = await async_client.post("/cart/item", json={"product_id": 9999, "quantity": 1})
+
+    items = (await async_session.scalars(select(CartItem))).all()
+
+    assert out_of_stock.status_code == status.HTTP_400_BAD_REQUEST
+    assert "current quantity: 0" in out_of_stock.json()["detail"]
+    assert not_found.status_code == status.HTTP_400_BAD_REQUEST
+    assert not_found.json()["detail"] == "product_id 9999 is not found"
+    assert not items
+
+
 async def test_get_cart(setup,
                         async_client: AsyncClient,
-                        async_session: AsyncSession):
+                        async_session: AsyncSession,
+                        async_engine):
     user, products = setup["user"], setup["products"]
     cart = Cart(id=1,
                 user=user,
@@ -99,8 +133,18 @@ async def test_get_cart(setup,
                        CartItem(cart_id=1, product_id=products[1].id, quantity=1)])
     async_session.add(cart)
     await async_session.flush()
+    async_session.expunge_all()
+
+    statements = []
 
-    response = await async_client.get("/cart")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = await async_client.get("/cart")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
 
     data = response.json()
 
@@ -108,3 +152,68 @@ async def test_get_cart(setup,
     # assert data["user_id"] == user.id
     assert len(data["items"]) == 2
     assert data["items"][0]["id"] == products[0].id
+    assert data["items"][0]["product"]["name"] == products[0].name
+    assert data["total_price"] == 10000 * 2 + 20000
+    assert data["item_count"] == 3
+    # revision 조회 + 아이템/합계 조회, 아이템 수와 무관
+    assert len(statements) == 2
+
+
+async def test_get_cart_not_modified(setup,
+                                     async_client: AsyncClient,
+                                     async_session: AsyncSession):
+    products = setup["products"]
+    await async_client.post("/cart/item", json={"product_id": products[0].id, "quantity": 1})
+
+    first = await async_client.get("/cart")
+    etag = first.headers["etag"]
+    second = await async_client.get("/cart", headers={"If-None-Match": etag})
+
+    # 장바구니가 변경되면 revision이 증가하여 ETag가 바뀜
+    await async_client.post("/cart/item", json={"product_id": products[0].id, "quantity": 1})
+    third = await async_client.get("/cart", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert third.status_code == 200
+    assert third.json()["items"][0]["quantity"] == 2
+
+
+async def test_add_cart_items_bulk(setup,
+                                   async_session: AsyncSession,
+                                   async_client: AsyncClient):
+    """여러 상품을 한 번에 추가, 이미 담긴 상품과 요청 내 중복 상품은 수량 합산"""
+    user, products = setup["user"], setup["products"]
+    cart = Cart(user_id=user.id)
+    async_session.add(cart)
+    cart.items.append(CartItem(product_id=products[0].id, quantity=1))
+    await async_session.flush()
+
+    json = [{"product_id": products[0].id, "quantity": 2},
+            {"product_id": products[1].id, "quantity": 1},
+            {"product_id": products[0].id, "quantity": 3}]
+    response = await async_client.post("/cart/items", json=json)
+
+    items = (await async_session.scalars(select(CartItem)
+                                         .where(CartItem.cart_id == cart.id)
+                                         .order_by(CartItem.product_id)
+                                         .execution_options(populate_existing=True))).all()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [(item.product_id, item.quantity) for item in items] == [(products[0].id, 6), (products[1].id, 1)]
+
+
+async def test_add_cart_items_bulk_insufficient_quantity(setup,
+                                                         async_session: AsyncSession,
+                                                         async_client: AsyncClient):
+    """하나라도 재고가 부족하면 아무것도 담기지 않음"""
+    user, products = setup["user"], setup["products"]
+
+    json = [{"product_id": products[0].id, "quantity": 1},
+            {"product_id": products[2].id, "quantity": 1}]
+    response = await async_client.post("/cart/items", json=json)
+
+    items = (await async_session.scalars(select(CartItem))).all()
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert str(products[2].id) in response.json()["detail"]
+    assert not items
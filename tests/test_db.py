@@ -1,7 +1,15 @@
-from sqlalchemy import select
+import asyncio
+
+import pytest
+from sqlalchemy import select, text, event
 from sqlalchemy.dialects.sqlite import insert
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 
+from app.db.batcher import WriteBatcher
+from app.core.config import DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_WRITE_POOL_SIZE
+from app.db.session import create_engine, create_read_engine, is_sqlite_file, _pool_options
 from app.models import User
 
 
@@ -25,3 +33,98 @@ async def test_db(async_session: AsyncSession):
     await async_session.refresh(old_user)
 
     print(f"user's email after update >> {old_user.hashed_password}")
+
+
+async def test_sqlite_file_engine_pragmas(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragma.db'}")
+
+    async with engine.connect() as conn:
+        journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+        synchronous = await conn.scalar(text("PRAGMA synchronous"))
+        busy_timeout = await conn.scalar(text("PRAGMA busy_timeout"))
+        temp_store = await conn.scalar(text("PRAGMA temp_store"))
+    await engine.dispose()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5000
+    assert temp_store == 2  # MEMORY
+    assert engine.pool._pre_ping is False
+
+
+def test_engine_pool_options(tmp_path):
+    file_engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    memory_engine = create_engine("sqlite+aiosqlite://")
+
+    # 단일 writer 제한은 파일 sqlite에만 적용
+    assert file_engine.pool.size() == DB_WRITE_POOL_SIZE
+    assert file_engine.pool._max_overflow == 0
+    assert isinstance(memory_engine.pool, StaticPool)
+    assert _pool_options("postgresql+asyncpg://user@localhost/db", None) == {
+        "pool_size": DB_POOL_SIZE, "pool_timeout": DB_POOL_TIMEOUT
+    }
+
+
+def test_is_sqlite_file():
+    assert is_sqlite_file("sqlite+aiosqlite:///./app.db")
+    assert not is_sqlite_file("sqlite+aiosqlite://")
+    assert not is_sqlite_file("sqlite+aiosqlite:///:memory:")
+    assert not is_sqlite_file("postgresql+asyncpg://user@localhost/db")
+
+
+async def test_sqlite_read_engine_is_read_only(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'read_write.db'}"
+    write_engine = create_engine(url)
+    read_engine = create_read_engine(url, write_engine)
+
+    async with write_engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+    # 쓰기 트랜잭션이 열려 있어도 읽기 연결은 대기하지 않음
+    async with write_engine.connect() as write_conn, read_engine.connect() as read_conn:
+        await write_conn.execute(text("INSERT INTO items (id) VALUES (2)"))
+
+        assert await read_conn.scalar(text("SELECT count(*) FROM items")) == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            await read_conn.execute(text("INSERT INTO items (id) VALUES (3)"))
+
+    await read_engine.dispose()
+    await write_engine.dispose()
+
+    assert read_engine is not write_engine
+    assert create_read_engine("sqlite+aiosqlite://", write_engine) is write_engine
+
+
+async def test_write_batcher_group_commit(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(conn))
+    batcher = WriteBatcher(async_sessionmaker(engine, expire_on_commit=False),
+                           max_delay_seconds=0.01,
+                           max_batch_size=64)
+
+    def insert_item(item_id: int):
+        async def work(session: AsyncSession):
+            await session.execute(text(f"INSERT INTO items (id) VALUES ({item_id})"))
+            if item_id == 3:
+                raise ValueError("failed work")
+            return item_id
+
+        return work
+
+    results = await asyncio.gather(*[batcher.submit(insert_item(i)) for i in range(20)], return_exceptions=True)
+
+    async with engine.connect() as conn:
+        item_ids = (await conn.scalars(text("SELECT id FROM items ORDER BY id"))).all()
+    await engine.dispose()
+
+    # 실패한 작업만 롤백되고 나머지는 한 번에 commit
+    assert isinstance(results[3], ValueError)
+    assert [r for r in results if not isinstance(r, Exception)] == item_ids
+    assert item_ids == [i for i in range(20) if i != 3]
+    assert len(commits) == 1
+    assert batcher.stats()["batches"] == 1
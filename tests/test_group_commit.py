@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.role import Role
+from app.core.security import create_access_token
+from app.db import batcher
+from app.db.batcher import WriteBatcher, commit_write
+from app.models import User, Product, Cart, CartItem
+from app.schemas.user import UserData
+
+
+@pytest_asyncio.fixture
+async def write_batcher(file_session_factory, monkeypatch):
+    """DB_GROUP_COMMIT_ENABLED=true 상태"""
+    write_batcher = WriteBatcher(file_session_factory, max_delay_seconds=0.05, max_batch_size=64)
+    monkeypatch.setattr(batcher, "write_batcher", write_batcher)
+    return write_batcher
+
+
+async def test_add_cart_item_group_commit(file_session_factory, write_batcher, file_client: AsyncClient):
+    async with file_session_factory() as session:
+        users = [User(id=user_id, email=f"user{user_id}@example.com", hashed_password="test",
+                      role=Role.USER, is_active=True) for user_id in (1, 2, 3)]
+        session.add_all(users)
+        session.add_all([Product(id=1, name="in stock", description="desc", quantity=10, price=1000),
+                         Product(id=2, name="sold out", description="desc", quantity=0, price=1000)])
+        await session.commit()
+        tokens = [create_access_token(UserData.model_validate(user)) for user in users]
+
+    requests = [(tokens[0], 1, 1), (tokens[1], 2, 1), (tokens[2], 1, 2)]
+    responses = await asyncio.gather(*[
+        file_client.post("/cart/item", json={"product_id": product_id, "quantity": quantity},
+                    headers={"Cookie": f"access_token={token}"})
+        for token, product_id, quantity in requests
+    ])
+
+    async with file_session_factory() as session:
+        carts = (await session.execute(select(Cart.user_id, CartItem.product_id, CartItem.quantity)
+                                       .join(Cart.items).order_by(Cart.user_id))).all()
+        cart_user_ids = (await session.scalars(select(Cart.user_id).order_by(Cart.user_id))).all()
+
+    # 재고가 없는 요청의 SAVEPOINT만 롤백되고 같은 배치의 나머지 요청은 commit
+    assert [response.status_code for response in responses] == [201, 400, 201]
+    assert carts == [(1, 1, 1), (3, 1, 2)]
+    assert cart_user_ids == [1, 3]
+    assert write_batcher.stats()["batches"] == 1
+
+
+async def test_commit_write_in_transaction_bypass(file_session_factory, write_batcher):
+    async with file_session_factory() as session:
+        await session.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        await session.commit()
+
+        # 요청 세션이 하나뿐인 쓰기 연결을 점유한 상태, 배치로 넘기면 연결을 기다리며 멈춤
+        await session.execute(text("SELECT 1"))
+        assert session.in_transaction()
+
+        async def insert_item(write_session: AsyncSession):
+            await write_session.execute(text("INSERT INTO items (id) VALUES (1)"))
+            return 1
+
+        result = await asyncio.wait_for(commit_write(session, insert_item), timeout=5)
+        item_ids = (await session.scalars(text("SELECT id FROM items"))).all()
+
+    assert result == 1
+    assert item_ids == [1]
+    assert write_batcher.stats()["works"] == 0
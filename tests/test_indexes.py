@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, Executable
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants.product_sort import ProductSort
+from app.db.session import Base
+from app.models import CartItem, OrderItem, Product
+from app.services.cart import cart_revision_query, cart_items_query, product_stocks_query, upsert_cart_stmt, \
+    upsert_cart_item_stmt, upsert_cart_items_stmt
+from app.services.order import user_cart_query, order_count_query, orders_page_query, orders_export_query
+from app.services.product_import import product_name_exists_query
+from app.services.product_listing import apply_sort, apply_keyset, apply_filters
+from app.services.product_search import search_query
+from app.services.refresh_token import rotate_token_stmt, raced_token_query, revoke_family_stmt, \
+    evict_old_sessions_stmt
+from app.services.stock import reserve_stock_stmt
+from app.services.sweeper import expired_refresh_tokens_stmt, idle_carts_query, cart_items_by_carts_stmt
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# 엔드포인트, 서비스가 실행하는 쿼리를 같은 query helper로 생성
+QUERIES = {
+    "add_product duplicate name": product_name_exists_query("product"),
+    "get_products_by_cursor": apply_keyset(apply_sort(select(Product), ProductSort.ID),
+                                           ProductSort.ID, {"id": 100}).limit(51),
+    "get_products newest": apply_keyset(apply_sort(select(Product), ProductSort.NEWEST),
+                                        ProductSort.NEWEST, {"sort": "newest", "id": 100}).limit(50),
+    "get_products price asc": apply_keyset(apply_sort(apply_filters(select(Product), 1000, 5000, True),
+                                                      ProductSort.PRICE_ASC),
+                                           ProductSort.PRICE_ASC, {"sort": "price_asc", "value": 1000, "id": 1}),
+    "get_products price desc": apply_keyset(apply_sort(select(Product), ProductSort.PRICE_DESC),
+                                            ProductSort.PRICE_DESC, {"sort": "price_desc", "value": 1000, "id": 1}),
+    "get_products name": apply_keyset(apply_sort(apply_filters(select(Product), in_stock=True), ProductSort.NAME),
+                                      ProductSort.NAME, {"sort": "name", "value": "a", "id": 1}).limit(50),
+    "search_products": search_query('"apple"*', 21, (-1.0, 1)),
+    "get_cart revision": cart_revision_query(1),
+    "get_cart items": cart_items_query(1),
+    "add_cart_item upsert cart": upsert_cart_stmt(1),
+    "add_cart_item upsert item": upsert_cart_item_stmt(1, 1, 1),
+    "add_cart_items stocks": product_stocks_query([1, 2]),
+    "add_cart_items upsert items": upsert_cart_items_stmt(1, {1: 1, 2: 2}),
+    "create_order cart": user_cart_query(1),
+    # selectinload가 실행하는 아이템 조회
+    "create_order cart items": select(CartItem).where(CartItem.cart_id.in_([1])),
+    "create_order reserve stock": reserve_stock_stmt({1: 1, 2: 2}),
+    "get_order count": order_count_query(1),
+    "get_order orders": orders_page_query(1, page=3, size=50),
+    "get_order items": select(OrderItem).where(OrderItem.order_id.in_([1, 2, 3])),
+    "export_orders": orders_export_query(1),
+    "refresh token rotate": rotate_token_stmt("hash", "new hash", NOW),
+    "refresh token raced": raced_token_query("hash", NOW),
+    "refresh token revoke family": revoke_family_stmt("family"),
+    "signin evict old sessions": evict_old_sessions_stmt(1, 5),
+    "sweep expired refresh tokens": expired_refresh_tokens_stmt(NOW, 500),
+    "sweep idle carts": idle_carts_query(NOW, 500),
+    "sweep idle cart items": cart_items_by_carts_stmt([1, 2]),
+}
+# 관련도 순 정렬, 한 장바구니의 아이템 순서는 인덱스로 정렬할 수 없어 조회 결과만 메모리에서 정렬
+SORTED_IN_MEMORY = {"search_products", "get_cart items"}
+FULL_SCAN_FORBIDDEN = ("products", "cart_items", "orders")
+
+
+async def explain_query_plan(session: AsyncSession, stmt: Executable) -> list[str]:
+    compiled = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    connection = await session.connection()
+    rows = (await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}",
+                                             tuple(params[name] for name in compiled.positiontup))).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", QUERIES.keys())
+async def test_query_uses_index(name: str, async_session: AsyncSession):
+    plan = await explain_query_plan(async_session, QUERIES[name])
+
+    for detail in plan:
+        # 인덱스 없는 테이블 풀스캔, 정렬을 위한 임시 B-tree가 없어야 함
+        # 상품, 장바구니 아이템, 주문은 인덱스 전체 순회도 허용하지 않음
+        step, target = detail.split()[:2]
+        if step == "SCAN" and target in Base.metadata.tables:
+            assert "INDEX" in detail and target not in FULL_SCAN_FORBIDDEN, plan
+        if name not in SORTED_IN_MEMORY:
+            assert "TEMP B-TREE" not in detail, plan
@@ -0,0 +1,29 @@
+from httpx import AsyncClient
+
+from app.constants.role import Role
+from app.core.security import create_access_token
+from app.schemas.user import UserData
+
+
+async def test_get_metrics(async_client: AsyncClient):
+    token = create_access_token(UserData(id=1, email="admin@example.com", role=Role.ADMIN, is_active=True))
+    async_client.cookies = {"access_token": token}
+
+    response = await async_client.get("/metrics")
+    data = response.json()
+
+    assert response.status_code == 200
+    assert {"hits", "misses", "evictions", "memory_bytes"} <= data["product_cache"].keys()
+    assert {"hits", "misses"} <= data["token_cache"].keys()
+    assert {"runs", "reclaimed"} <= data["sweeper"].keys()
+
+
+async def test_get_metrics_requires_admin(async_client: AsyncClient):
+    anonymous = await async_client.get("/metrics")
+
+    token = create_access_token(UserData(id=2, email="user@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    user = await async_client.get("/metrics")
+
+    assert anonymous.status_code == 401
+    assert user.status_code == 403
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.migrations import _merge_duplicate_cart_items, _rename_duplicate_product_names, _migrate
+from app.db.session import Base
+from app.models.product import SEARCH_TABLE
+
+
+@pytest.fixture
+def conn():
+    # unique 인덱스가 생기기 전의 cart_items, products 테이블
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE cart_items ("
+                          "id INTEGER PRIMARY KEY, cart_id INTEGER NOT NULL, "
+                          "product_id INTEGER NOT NULL, quantity INTEGER NOT NULL)"))
+        conn.execute(text("CREATE TABLE products ("
+                          "id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, normalized_name VARCHAR NOT NULL)"))
+        yield conn
+    engine.dispose()
+
+
+def _cart_items(conn) -> list[tuple]:
+    return conn.execute(text("SELECT id, cart_id, product_id, quantity FROM cart_items ORDER BY id")).all()
+
+
+def test_merge_duplicate_cart_items(conn):
+    conn.execute(text("INSERT INTO cart_items (id, cart_id, product_id, quantity) VALUES "
+                      "(1, 1, 1, 1), (2, 1, 2, 1), (3, 1, 1, 2), (4, 2, 1, 5), (5, 1, 1, 4)"))
+
+    _merge_duplicate_cart_items(conn)
+    merged = _cart_items(conn)
+    # 중복은 가장 작은 id로 합쳐지고 다른 장바구니의 같은 상품은 유지
+    assert merged == [(1, 1, 1, 7), (2, 1, 2, 1), (4, 2, 1, 5)]
+
+    _merge_duplicate_cart_items(conn)
+    assert _cart_items(conn) == merged
+
+
+def test_rename_duplicate_product_names(conn):
+    conn.execute(text("INSERT INTO products (id, name, normalized_name) VALUES "
+                      "(1, 'apple', 'apple'), (2, 'apple ', 'apple'), (3, 'pear', 'pear')"))
+
+    _rename_duplicate_product_names(conn)
+    conn.execute(text("CREATE UNIQUE INDEX ux_products_normalized_name ON products (normalized_name)"))
+
+    rows = conn.execute(text("SELECT id, name, normalized_name FROM products ORDER BY id")).all()
+    assert rows == [(1, "apple", "apple"), (2, "apple  (2)", "apple (2)"), (3, "pear", "pear")]
+
+
+def test_migrate_duplicate_product_names_with_search_index():
+    """검색 인덱스 trigger가 있는 상태에서 기존 상품(검색 인덱스 생성 전 데이터)의 중복 이름 정리"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        conn.execute(text("DROP INDEX ux_products_normalized_name"))
+        conn.execute(text("INSERT INTO products (id, name, normalized_name, description, price, quantity) VALUES "
+                          "(1, 'apple', 'apple', 'red', 100, 1), (2, 'apple', 'apple', 'green', 100, 1)"))
+        # 상품보다 나중에 생성되어 아직 비어 있는 검색 인덱스
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('delete-all')"))
+
+        _migrate(conn)
+
+        conn.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('integrity-check')"))
+        names = conn.scalars(text("SELECT name FROM products ORDER BY id")).all()
+        matched = conn.scalars(text(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH '\"2\"'")).all()
+    engine.dispose()
+
+    assert names == ["apple", "apple (2)"]
+    assert matched == [2]
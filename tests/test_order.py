@@ -1,18 +1,22 @@
+import asyncio
+import json as json_module
 import copy
 from datetime import datetime
 from typing import List
 
 import pytest_asyncio
 import rich
-from httpx import AsyncClient
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select, func, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import selectinload
 from starlette import status
 
 from app.constants.order_status import OrderStatus
 from app.constants.role import Role
 from app.core.security import create_access_token
+from app.db.session import Base, get_session
+from app.main import app
 from app.models import User, Product, Cart, CartItem, OrderItem, Order
 from app.schemas.user import UserData
 
@@ -169,10 +173,14 @@ async def test_get_order_list(setup, async_client: AsyncClient, async_session: A
     order1 = Order(user_id=1, shipping_address="test")
     order2 = Order(user_id=1, shipping_address="test")
 
-    order_item1 = OrderItem(order=order1, product_id=product1.id, order_price=product1.price, quantity=2)
-    order_item2 = OrderItem(order=order1, product_id=product2.id, order_price=product2.price, quantity=4)
-    order_item3 = OrderItem(order=order2, product_id=product1.id, order_price=product2.price, quantity=1)
-    order_item4 = OrderItem(order=order2, product_id=product2.id, order_price=product2.price, quantity=1)
+    order_item1 = OrderItem(order=order1, product_id=product1.id, product_name=product1.name,
+                            order_price=product1.price, quantity=2)
+    order_item2 = OrderItem(order=order1, product_id=product2.id, product_name=product2.name,
+                            order_price=product2.price, quantity=4)
+    order_item3 = OrderItem(order=order2, product_id=product1.id, product_name=product1.name,
+                            order_price=product2.price, quantity=1)
+    order_item4 = OrderItem(order=order2, product_id=product2.id, product_name=product2.name,
+                            order_price=product2.price, quantity=1)
     order1.items = [order_item1, order_item2]
     order2.items = [order_item3, order_item4]
     order1.total_price = order1.calculate_total_price()
@@ -188,3 +196,135 @@ async def test_get_order_list(setup, async_client: AsyncClient, async_session: A
 
     assert data["size"] == 2
     assert order1["user_id"] == user.id and order2["user_id"] == user.id
+
+
+# 같은 상품에 대한 동시 주문에서 재고 초과 판매가 없는가?
+async def test_create_order_concurrently_no_oversell(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'concurrency.db'}",
+                                 connect_args={"timeout": 60},
+                                 pool_size=20)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    stock, buyers = 50, 200
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_maker() as session:
+        product = Product(name="hot product", description="desc", price=1000, quantity=stock)
+        users = [User(email=f"user{i}@example.com", hashed_password="test") for i in range(buyers)]
+        session.add(product)
+        session.add_all(users)
+        await session.flush()
+        session.add_all([Cart(user_id=user.id, items=[CartItem(product_id=product.id, quantity=1)])
+                         for user in users])
+        await session.commit()
+        tokens = [create_access_token(UserData.model_validate(user)) for user in users]
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test/api/v1") as client:
+            responses = await asyncio.gather(*[
+                client.post("/order", json={"shipping_address": "test"}, headers={"Cookie": f"access_token={token}"})
+                for token in tokens
+            ])
+    finally:
+        app.dependency_overrides.clear()
+
+    async with session_maker() as session:
+        remain = await session.scalar(select(Product.quantity).where(Product.id == product.id))
+        order_count = await session.scalar(select(func.count()).select_from(Order))
+    await engine.dispose()
+
+    success = [r for r in responses if r.status_code == status.HTTP_201_CREATED]
+    assert len(success) == stock
+    assert all(r.status_code == status.HTTP_400_BAD_REQUEST for r in responses if r not in success)
+    assert remain == 0
+    assert order_count == stock
+
+
+# 주문 수와 무관하게 주문 리스트 조회 쿼리 수가 일정한가?
+async def test_get_order_list_constant_query_count(setup,
+                                                   async_engine,
+                                                   async_client: AsyncClient,
+                                                   async_session: AsyncSession):
+    user, cart, products = setup["user"], setup["cart"], setup["products"]
+    for _ in range(5):
+        order = Order(user_id=user.id, shipping_address="test",
+                      items=[OrderItem(product_id=product.id, product_name=product.name,
+                                       order_price=product.price, quantity=1)
+                             for product in products])
+        order.total_price = order.calculate_total_price()
+        async_session.add(order)
+    await async_session.flush()
+    async_session.expunge_all()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = await async_client.get("/order?page=1&size=2")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["size"] == 2
+    assert data["total_items"] == 5
+    assert data["total_page"] == 3
+    assert data["items"][0]["items"][0]["product_name"] == products[0].name
+    assert len(statements) == 3
+
+
+# 주문시점의 상품 이름 스냅샷 검증
+async def test_order_product_name_snapshot(setup, async_client: AsyncClient, async_session: AsyncSession):
+    """Product의 이름이 변경되어도 주문 조회 시 구매당시 이름이 보이는가?"""
+    user, cart, products = setup["user"], setup["cart"], setup["products"]
+    original_name = products[0].name
+
+    async_session.add(CartItem(cart_id=cart.id, product_id=products[0].id, quantity=1))
+    await async_session.flush()
+
+    response = await async_client.post("/order", json={"shipping_address": "test"})
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["items"][0]["product_name"] == original_name
+
+    products[0].name = "renamed product"
+    await async_session.flush()
+
+    response = await async_client.get("/order")
+
+    assert response.json()["items"][0]["items"][0]["product_name"] == original_name
+
+
+async def test_export_orders(setup, async_client: AsyncClient, async_session: AsyncSession):
+    user, products = setup["user"], setup["products"]
+    for _ in range(3):
+        order = Order(user_id=user.id, shipping_address="test",
+                      items=[OrderItem(product_id=product.id, product_name=product.name,
+                                       order_price=product.price, quantity=1)
+                             for product in products[:2]])
+        order.total_price = order.calculate_total_price()
+        async_session.add(order)
+    # 다른 유저의 주문은 포함되지 않음
+    async_session.add(Order(user_id=user.id + 1, shipping_address="other", total_price=0))
+    await async_session.flush()
+
+    ndjson = await async_client.get("/order/export")
+    orders = [json_module.loads(line) for line in ndjson.text.splitlines()]
+    csv_response = await async_client.get("/order/export", params={"format": "csv"})
+    csv_lines = csv_response.text.splitlines()
+
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert len(orders) == 3
+    assert all(len(order["items"]) == 2 and order["user_id"] == user.id for order in orders)
+    assert csv_lines[0].startswith("order_id,status,total_price")
+    assert len(csv_lines) == 1 + 3 * 2
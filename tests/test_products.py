@@ -1,11 +1,19 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select, exists
+from sqlalchemy import select, exists, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants.role import Role
 from app.core.security import create_access_token
+from app.models import Product, EntityCount
 from app.schemas.user import UserData
+from app.services.counter import get_count, reconcile_counts
+from app.services.product_cache import product_cache
+from app.services.product_import import MAX_LINE_LENGTH
 
 
 @pytest.mark.asyncio
@@ -28,3 +36,307 @@ async def test_add_product(async_client: AsyncClient, async_session: AsyncSessio
     assert data["description"] == payload["description"]
     assert data["price"] == payload["price"]
     assert data["quantity"] == payload["quantity"]
+
+
+async def test_get_products_by_cursor(async_client: AsyncClient, async_session: AsyncSession):
+    products = [Product(name=f"product {i}", description="desc", price=1000, quantity=1) for i in range(5)]
+    async_session.add_all(products)
+    await async_session.flush()
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"size": 2} if cursor is None else {"size": 2, "after": cursor}
+        response = await async_client.get("/products/cursor", params=params)
+        assert response.status_code == 200
+
+        data = response.json()
+        ids += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert ids == [p.id for p in products]
+
+
+async def test_get_products_by_invalid_cursor(async_client: AsyncClient):
+    response = await async_client.get("/products/cursor", params={"after": "invalid"})
+
+    assert response.status_code == 400
+
+
+async def test_get_products_total_items(async_client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all([Product(name=f"product {i}", description="desc", price=1000, quantity=1) for i in range(3)])
+    await async_session.flush()
+
+    response = await async_client.get("/products", params={"page": 1, "size": 2})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["size"] == 2
+    assert data["total_items"] == 3
+    assert data["total_page"] == 2
+
+
+async def test_reconcile_counts(async_session: AsyncSession):
+    async_session.add_all([Product(name=f"product {i}", description="desc", price=1000, quantity=1) for i in range(3)])
+    await async_session.execute(update(EntityCount).where(EntityCount.name == "products").values(count=100))
+    await async_session.flush()
+
+    await reconcile_counts(async_session)
+
+    assert await get_count(async_session, "products") == 3
+
+
+async def test_get_products_cached(async_client: AsyncClient, async_session: AsyncSession):
+    product = Product(name="cached product", description="desc", price=1000, quantity=1)
+    async_session.add(product)
+    await async_session.flush()
+
+    first = await async_client.get("/products", params={"page": 1, "size": 10})
+    hits = product_cache.stats()["hits"]
+
+    # DB를 직접 수정해도 캐시된 응답 반환
+    product.price = 2000
+    await async_session.flush()
+    second = await async_client.get("/products", params={"page": 1, "size": 10})
+
+    assert second.json() == first.json()
+    assert product_cache.stats()["hits"] == hits + 1
+    assert product_cache.stats()["memory_bytes"] > 0
+
+
+async def test_add_product_invalidate_cache(async_client: AsyncClient, async_session: AsyncSession):
+    token = create_access_token(UserData(id=1, email="test@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    async_session.add(Product(name="product 1", description="desc", price=1000, quantity=1))
+    await async_session.flush()
+
+    first = await async_client.get("/products/cursor")
+    await async_client.post("/products", json={"name": "product 2", "description": "desc", "price": 1000, "quantity": 1})
+    second = await async_client.get("/products/cursor")
+
+    assert first.json()["size"] == 1
+    assert second.json()["size"] == 2
+
+
+async def test_get_product(async_client: AsyncClient, async_session: AsyncSession):
+    product = Product(name="product 1", description="desc", price=1000, quantity=1)
+    async_session.add(product)
+    await async_session.flush()
+
+    response = await async_client.get(f"/products/{product.id}")
+    not_found = await async_client.get("/products/9999")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == product.name
+    assert not_found.status_code == 404
+
+
+async def test_get_products_not_modified(async_client: AsyncClient, async_session: AsyncSession):
+    async_session.add(Product(name="product 1", description="desc", price=1000, quantity=1))
+    await async_session.flush()
+
+    first = await async_client.get("/products", params={"page": 1, "size": 10})
+    etag = first.headers["etag"]
+    second = await async_client.get("/products", params={"page": 1, "size": 10},
+                                    headers={"If-None-Match": etag})
+
+    # 카탈로그가 변경되면 ETag도 바뀜
+    await product_cache.invalidate()
+    third = await async_client.get("/products", params={"page": 1, "size": 10},
+                                   headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert third.status_code == 200
+    assert third.headers["etag"] != etag
+
+
+async def test_search_products(async_client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all([
+        Product(name="banana", description="apple flavored", price=1000, quantity=1),
+        Product(name="green apple", description="fresh", price=1000, quantity=1),
+        Product(name="applesauce", description="sweet", price=1000, quantity=1),
+        Product(name="orange", description="citrus", price=1000, quantity=1),
+    ])
+    await async_session.flush()
+
+    response = await async_client.get("/products/search", params={"q": "appl"})
+    names = [item["name"] for item in response.json()["items"]]
+
+    assert response.status_code == 200
+    # prefix 일치, 이름에 일치하는 상품이 설명에만 일치하는 상품보다 먼저
+    assert set(names) == {"banana", "green apple", "applesauce"}
+    assert names[-1] == "banana"
+
+
+async def test_search_products_cursor(async_client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all([Product(name=f"phone {i}", description="desc", price=1000, quantity=1) for i in range(5)])
+    await async_session.flush()
+
+    first = (await async_client.get("/products/search", params={"q": "phone", "size": 3})).json()
+    second = (await async_client.get("/products/search",
+                                     params={"q": "phone", "size": 3, "after": first["next_cursor"]})).json()
+
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert len(ids) == 5 and len(set(ids)) == 5
+    assert second["next_cursor"] is None
+
+
+async def test_search_products_index_sync(async_client: AsyncClient, async_session: AsyncSession):
+    """상품 이름 변경, 삭제가 검색 인덱스에 반영되는가?"""
+    renamed = Product(name="old name", description="desc", price=1000, quantity=1)
+    deleted = Product(name="old deleted", description="desc", price=1000, quantity=1)
+    async_session.add_all([renamed, deleted])
+    await async_session.flush()
+
+    renamed.name = "new name"
+    await async_session.delete(deleted)
+    await async_session.flush()
+
+    old = await async_client.get("/products/search", params={"q": "old"})
+    new = await async_client.get("/products/search", params={"q": "new"})
+    # FTS5 문법 문자는 검색어로 취급
+    syntax = await async_client.get("/products/search", params={"q": 'new"* -('})
+    invalid = await async_client.get("/products/search", params={"q": "!!"})
+
+    assert old.json()["items"] == []
+    assert [item["name"] for item in new.json()["items"]] == ["new name"]
+    assert [item["name"] for item in syntax.json()["items"]] == ["new name"]
+    assert invalid.status_code == 400
+
+
+async def test_get_products_filter_and_sort(async_client: AsyncClient, async_session: AsyncSession):
+    async_session.add_all([
+        Product(name="product c", description="desc", price=3000, quantity=1),
+        Product(name="product a", description="desc", price=1000, quantity=0),
+        Product(name="product b", description="desc", price=2000, quantity=1),
+        Product(name="product d", description="desc", price=2000, quantity=1),
+    ])
+    await async_session.flush()
+
+    response = await async_client.get("/products", params={"min_price": 1500, "in_stock": True, "sort": "price_desc"})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert [item["name"] for item in data["items"]] == ["product c", "product d", "product b"]
+    assert data["total_items"] == 3
+
+
+@pytest.mark.parametrize("sort, expected", [
+    ("newest", ["product d", "product c", "product b", "product a"]),
+    ("price_asc", ["product b", "product c", "product d", "product a"]),
+    ("name", ["product a", "product b", "product c", "product d"]),
+])
+async def test_get_products_by_cursor_sorted(async_client: AsyncClient, async_session: AsyncSession,
+                                             sort: str, expected: list[str]):
+    async_session.add_all([
+        Product(name="product a", description="desc", price=3000, quantity=1),
+        Product(name="product b", description="desc", price=1000, quantity=1),
+        Product(name="product c", description="desc", price=2000, quantity=1),
+        Product(name="product d", description="desc", price=2000, quantity=1),
+    ])
+    await async_session.flush()
+
+    names, cursor = [], None
+    while True:
+        params = {"sort": sort, "size": 1} | ({"after": cursor} if cursor else {})
+        data = (await async_client.get("/products/cursor", params=params)).json()
+        names += [item["name"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    # 다른 정렬의 cursor는 사용할 수 없음
+    first = (await async_client.get("/products/cursor", params={"sort": sort, "size": 1})).json()
+    other_sort = "price_desc"
+    mismatch = await async_client.get("/products/cursor",
+                                      params={"sort": other_sort, "after": first["next_cursor"]})
+
+    assert names == expected
+    assert mismatch.status_code == 400
+
+
+async def test_import_products_ndjson(async_client: AsyncClient, async_session: AsyncSession):
+    token = create_access_token(UserData(id=1, email="test@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    async_session.add(Product(name="existing", description="desc", price=1000, quantity=1))
+    await async_session.flush()
+
+    lines = [
+        {"name": "product 1", "description": "desc", "price": 1000, "quantity": 1},
+        {"name": "existing", "description": "desc", "price": 1000, "quantity": 1},
+        {"name": "product 2", "description": "desc", "price": 10, "quantity": 1},
+        {"name": " product 1 ", "description": "desc", "price": 1000, "quantity": 1},
+        {"name": "product 3", "description": "desc", "price": 3000, "quantity": 5},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+
+    response = await async_client.post("/products/import", content=body.encode())
+    reports = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    # 검증 에러는 바로, 중복은 batch insert 후 보고되므로 순서는 줄 번호 순이 아님
+    assert sorted((report["line"], report["status"]) for report in reports[:-1]) == [
+        (2, "duplicate"), (3, "error"), (4, "duplicate"), (6, "error")]
+    assert reports[-1] == {"status": "summary", "created": 2, "duplicate": 2, "error": 2}
+    names = (await async_session.scalars(select(Product.name).order_by(Product.id))).all()
+    assert names == ["existing", "product 1", "product 3"]
+    assert await get_count(async_session, "products") == 3
+
+
+async def test_import_products_csv(async_client: AsyncClient, async_session: AsyncSession):
+    token = create_access_token(UserData(id=1, email="test@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    body = 'name,description,price,quantity\r\n"product, 1",desc,1000,1\r\nproduct 2,desc,abc,1\r\n'
+
+    async def chunks():
+        # 여러 chunk로 나뉘어 들어오는 요청 body
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7].encode()
+
+    response = await async_client.post("/products/import", params={"format": "csv"}, content=chunks())
+    reports = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [report["status"] for report in reports] == ["error", "summary"]
+    assert reports[-1]["created"] == 1
+    assert await async_session.scalar(select(Product.name)) == "product, 1"
+
+
+async def test_import_products_format_error_keeps_pending_batch(async_client: AsyncClient,
+                                                                async_session: AsyncSession,
+                                                                monkeypatch):
+    """형식 오류 전까지 검증된 row는 batch 크기와 무관하게 insert"""
+    monkeypatch.setattr("app.api.v1.endpoints.products.PRODUCT_IMPORT_BATCH_SIZE", 100)
+    token = create_access_token(UserData(id=1, email="test@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    lines = [json.dumps({"name": f"product {i}", "description": "desc", "price": 1000, "quantity": 1})
+             for i in range(5)]
+    body = "\n".join(lines) + "\n" + "x" * (MAX_LINE_LENGTH + 1)
+
+    response = await async_client.post("/products/import", content=body.encode())
+    reports = [json.loads(line) for line in response.text.splitlines()]
+
+    assert reports[0]["line"] == 6
+    assert reports[0]["status"] == "error"
+    assert reports[-1] == {"status": "summary", "created": 5, "duplicate": 0, "error": 1}
+    assert await async_session.scalar(select(func.count()).select_from(Product)) == 5
+
+
+async def test_export_products(async_client: AsyncClient, async_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr("app.api.v1.endpoints.products.EXPORT_BATCH_SIZE", 2)
+    token = create_access_token(UserData(id=1, email="test@example.com", role=Role.USER, is_active=True))
+    async_client.cookies = {"access_token": token}
+    async_session.add_all([Product(name=f"product {i}", description="desc, with comma", price=1000, quantity=i)
+                           for i in range(5)])
+    await async_session.flush()
+
+    ndjson = await async_client.get("/products/export")
+    csv_response = await async_client.get("/products/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+
+    assert [json.loads(line)["name"] for line in ndjson.text.splitlines()] == [f"product {i}" for i in range(5)]
+    assert csv_response.headers["content-disposition"] == "attachment; filename=products.csv"
+    assert [row["quantity"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert rows[0]["description"] == "desc, with comma"
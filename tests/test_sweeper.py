@@ -0,0 +1,37 @@
+from datetime import datetime, timezone, timedelta
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import User, RefreshToken, Cart, CartItem, Product
+from app.services.sweeper import Sweeper
+
+
+async def test_sweep_expired_tokens_and_idle_carts(async_engine, async_session: AsyncSession):
+    now = datetime.now(tz=timezone.utc)
+    product = Product(name="product 1", description="desc", price=1000, quantity=10)
+    users = [User(email=f"user{i}@example.com", hashed_password="test") for i in range(6)]
+    async_session.add_all([product, *users])
+    await async_session.flush()
+
+    # 만료된 토큰 5개, 유효한 토큰 1개
+    for i, user in enumerate(users):
+        expires_at = now + timedelta(days=1) if i == 0 else now - timedelta(days=1)
+        async_session.add(RefreshToken(user_id=user.id, token_hash=f"hash{i}", family_id=f"family{i}",
+                                       expires_at=expires_at))
+
+    # 오래된 장바구니 3개, 최근 장바구니 1개
+    for i, user in enumerate(users[:4]):
+        updated_at = now if i == 0 else now - timedelta(days=60)
+        async_session.add(Cart(user_id=user.id, updated_at=updated_at,
+                               items=[CartItem(product_id=product.id, quantity=1)]))
+    await async_session.commit()
+
+    sweeper = Sweeper(async_sessionmaker(async_engine, expire_on_commit=False), batch_size=2, cart_idle_days=30)
+    reclaimed = await sweeper.sweep()
+
+    assert reclaimed == {"refresh_tokens": 5, "carts": 3, "cart_items": 3}
+    assert await async_session.scalar(select(RefreshToken.token_hash)) == "hash0"
+    assert await async_session.scalar(select(Cart.user_id)) == users[0].id
+    assert await async_session.scalar(select(func.count()).select_from(CartItem)) == 1
+    assert sweeper.stats()["reclaimed"] == reclaimed
@@ -1,8 +1,12 @@
+import asyncio
+
 import pytest
+from fastapi import HTTPException
 from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.password import PasswordHasher
 from app.models import User
 
 
@@ -32,3 +36,29 @@ async def test_user_signup(async_client: AsyncClient, async_session: AsyncSessio
     assert db_user is not None
     assert db_user.email == payload["email"]
     assert db_user.id == data['user']['id']
+
+
+async def test_user_signup_duplicate_email(async_client: AsyncClient):
+    payload = {
+        "email": "user10001@example.com",
+        "password": "12345678"
+    }
+
+    first = await async_client.post("/users/signup", json=payload)
+    second = await async_client.post("/users/signup", json=payload)
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Email already exists"
+
+
+async def test_password_hasher_reject_when_saturated():
+    hasher = PasswordHasher(workers=1, queue_limit=0)
+
+    results = await asyncio.gather(hasher.hash("12345678"), hasher.hash("12345678"), return_exceptions=True)
+    hasher.shutdown()
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 503
+    assert hasher.in_flight == 0